@@ -0,0 +1,125 @@
+import math
+import random
+
+import numpy as np
+
+from input.grid import OccupancyGrid
+from input.roads import Roads, roads_small, roads_small_coords
+from search.problem import (EightTilesProblem, GridProblem, JumpingFrogsProblem, PancakeProblem, PourProblem,
+                            StreetProblem, VacuumWorldProblem)
+
+
+def random_roads(rng, cities, neighbours=3):
+    """
+    Random road map: cities scattered around Bari, each one linked in both directions to its nearest cities and to
+    the previous city, so that the map is connected
+    :param rng: a random.Random
+    :param cities: number of cities
+    :param neighbours: number of nearest cities linked to each city
+    :return: a Roads environment
+    """
+    names = [f'City {i}' for i in range(cities)]
+    coordinates = {name: (rng.uniform(40.5, 41.5), rng.uniform(16.0, 17.5)) for name in names}
+    streets = {name: set() for name in names}
+    for i, name in enumerate(names):
+        lat, long = coordinates[name]
+        nearest = sorted(names, key=lambda other: math.hypot(coordinates[other][0] - lat,
+                                                             coordinates[other][1] - long))
+        for other in nearest[1:neighbours + 1] + names[i - 1:i]:
+            if other != name:
+                streets[name].add(other)
+                streets[other].add(name)
+    return Roads(streets={name: sorted(next_cities) for name, next_cities in streets.items()},
+                 coordinates=coordinates)
+
+
+def street_problem(rng, cities=12):
+    """
+    Route between two random cities: of the small map of the examples, or of a random map with more cities
+    """
+    roads = Roads(streets=roads_small, coordinates=roads_small_coords) if cities <= len(roads_small) \
+        else random_roads(rng, cities)
+    initial_state, goal_state = rng.sample(sorted(roads.streets), 2)
+    return StreetProblem(initial_state=initial_state, goal_state=goal_state, environment=roads)
+
+
+def tiles_problem(rng, moves=20):
+    """
+    8-puzzle scrambled by a random walk from the goal, so that it is always solvable
+    """
+    problem = EightTilesProblem(initial_state=None)
+    state = problem.goal_state
+    for _ in range(moves):
+        state = rng.choice(problem.successors(state))[0]
+    return EightTilesProblem(initial_state=state)
+
+
+def grid_problem(rng, size=30, density=0.2):
+    """
+    Path between two random free cells of a square occupancy grid with random obstacles
+    """
+    generator = np.random.default_rng(rng.getrandbits(32))
+    occupancy = generator.random((size, size)) < density
+    free = list(zip(*np.nonzero(~occupancy)))
+    (y_start, x_start), (y_goal, x_goal) = rng.sample(free, 2)
+    return GridProblem(initial_state=(int(x_start), int(y_start)),
+                       goal_state=(int(x_goal), int(y_goal)),
+                       environment=OccupancyGrid(occupancy))
+
+
+def pour_problem(rng, capacity=10):
+    """
+    Three empty jugs of random sizes up to a capacity and a random amount of water to measure
+    """
+    sizes = tuple(sorted(rng.sample(range(2, capacity + 1), 3)))
+    return PourProblem(initial_state=(0, 0, 0), goal_state=rng.randrange(1, sizes[-1]), sizes=sizes)
+
+
+def pancake_problem(rng, size=6):
+    """
+    Random stack of pancakes
+    """
+    return PancakeProblem(initial_state=tuple(rng.sample(range(size), size)))
+
+
+def frogs_problem(rng, frogs=3):
+    """
+    Jumping frogs with a random number of frogs per side, up to two less than the given one
+    """
+    return JumpingFrogsProblem(N=rng.randint(max(1, frogs - 2), frogs))
+
+
+def vacuum_problem(rng, size=3):
+    """
+    Square vacuum world with random dirty cells and a random position of the vacuum
+    """
+    cells = size * size
+    dirt = tuple(rng.randrange(2) for _ in range(cells))
+    return VacuumWorldProblem(initial_state=dirt,
+                              goal_state=(0,) * cells,
+                              vacuum_position=(rng.randrange(size), rng.randrange(size)))
+
+
+# instance generators of the benchmark, called with a random.Random and the parameters of the profile
+GENERATORS = {
+    'street': street_problem,
+    'tiles': tiles_problem,
+    'grid': grid_problem,
+    'pour': pour_problem,
+    'pancake': pancake_problem,
+    'frogs': frogs_problem,
+    'vacuum': vacuum_problem,
+}
+
+
+def generate(name, index, seed, **parameters):
+    """
+    Generate an instance of a problem: the same name, index, seed and parameters always give the same instance,
+    independently of the other instances generated
+    :param name: the name of the generator
+    :param index: the index of the instance
+    :param seed: the seed of the benchmark
+    :param parameters: the parameters of the generator
+    :return: a problem
+    """
+    return GENERATORS[name](random.Random(f'{seed}-{name}-{index}'), **parameters)
@@ -0,0 +1,241 @@
+import gc
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+
+from benchmark.instances import generate
+from search.stats import SearchStats
+from search.strategies import *
+from search.tree_search import TreeSearch
+
+# quick: a few minutes, to run before and after a change; long: larger instances and more repetitions, nightly
+PROFILES = {
+    'quick': {
+        'instances': 2,
+        'repeat': 5,
+        'max_expansions': 2000,
+        'depth_limit': 20,
+        'problems': {
+            'street': {'cities': 12},
+            'tiles': {'moves': 12},
+            'grid': {'size': 30, 'density': 0.2},
+            'pour': {'capacity': 10},
+            'pancake': {'size': 6},
+            'frogs': {'frogs': 3},
+            'vacuum': {'size': 2},
+        },
+    },
+    'long': {
+        'instances': 5,
+        'repeat': 5,
+        'max_expansions': 100000,
+        # GraphRandom shuffles the whole fringe at every step
+        'limits': {'GraphRandom': 2000},
+        'depth_limit': 40,
+        'problems': {
+            'street': {'cities': 2000},
+            'tiles': {'moves': 40},
+            'grid': {'size': 200, 'density': 0.25},
+            'pour': {'capacity': 40},
+            'pancake': {'size': 8},
+            'frogs': {'frogs': 6},
+            'vacuum': {'size': 3},
+        },
+    },
+}
+
+# strategies of the benchmark: name, factory given the problem and the profile, True if it needs a heuristic
+STRATEGIES = [
+    ('BreadthFirst', lambda problem, profile: BreadthFirst(), False),
+    ('DepthFirst', lambda problem, profile: DepthFirst(), False),
+    ('DepthLimited', lambda problem, profile: DepthLimited(limit=profile['depth_limit']), False),
+    ('GraphBreadthFirst', lambda problem, profile: GraphBreadthFirst(), False),
+    ('GraphDepthFirst', lambda problem, profile: GraphDepthFirst(), False),
+    ('GraphDepthLimited', lambda problem, profile: GraphDepthLimited(limit=profile['depth_limit']), False),
+    ('GraphRandom', lambda problem, profile: GraphRandom(), False),
+    ('GraphUniformCost', lambda problem, profile: GraphUniformCost(), False),
+    ('Greedy', lambda problem, profile: Greedy(problem=problem), True),
+    ('AStar', lambda problem, profile: AStar(problem=problem), True),
+]
+
+# relative increase of time and memory reported, and the differences always ignored (noise). The time of the same
+# code varies by some tens of milliseconds between two runs: it is reported as a warning, never as a regression
+TOLERANCE = 0.25
+MIN_TIME = 0.1
+MIN_MEMORY = 2 ** 16
+
+
+def has_heuristic(problem):
+    """
+    Checks if the problem has a working heuristic function
+    """
+    try:
+        problem.h(problem.initial_state)
+    except Exception:
+        return False
+    return True
+
+
+def search(problem, strategy, max_expansions, stats=None):
+    """
+    Run a search stopping it after a maximum number of expansions
+    :param problem: the problem
+    :param strategy: the search strategy
+    :param max_expansions: the maximum number of expansions
+    :param stats: a SearchStats object, None to disable the statistics
+    :return: the result ('Ok', 'Fail' or 'Limit') and the goal node
+    """
+    steps = TreeSearch(problem=problem, strategy=strategy, stats=stats).steps()
+    try:
+        for result, node, _, step in steps:
+            if result != 'Running':
+                return result, node
+            if step >= max_expansions:
+                return 'Limit', None
+    finally:
+        steps.close()
+
+
+def measure(problem, name, factory, profile, seed):
+    """
+    Benchmark a strategy on a problem: a run under tracemalloc gives the counters and the peak memory, the median
+    time of the other runs gives the time. The random generator is seeded before every run (for GraphRandom).
+    :param problem: the problem
+    :param name: the name of the strategy
+    :param factory: a function building the strategy given the problem and the profile
+    :param profile: the profile
+    :param seed: the seed of the benchmark
+    :return: a dictionary with the measures
+    """
+    run = {'strategy': name}
+    max_expansions = profile.get('limits', {}).get(name, profile['max_expansions'])
+    try:
+        random.seed(seed)
+        stats = SearchStats(timing=False)
+        tracemalloc.start()
+        try:
+            result, node = search(problem, factory(problem, profile), max_expansions, stats)
+            run['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        times = []
+        for _ in range(profile['repeat']):
+            random.seed(seed)
+            strategy = factory(problem, profile)
+            gc.collect()
+            start = time.perf_counter()
+            search(problem, strategy, max_expansions)
+            times.append(time.perf_counter() - start)
+    except Exception as error:
+        run['result'] = 'Error: ' + repr(error)
+        return run
+
+    run.update(result=result,
+               cost=node.cost if result == 'Ok' else None,
+               depth=node.depth if result == 'Ok' else None,
+               expanded=stats.expanded,
+               generated=stats.generated,
+               fringe_peak=stats.fringe_peak,
+               time=statistics.median(times))
+    return run
+
+
+def run_benchmark(profile_name='quick', seed=0, problems=None, strategies=None, progress=None):
+    """
+    Run every applicable strategy on the instances of a profile
+    :param profile_name: the name of the profile
+    :param seed: the seed of the instances
+    :param problems: the names of the problems to run, None for all of them
+    :param strategies: the names of the strategies to run, None for all of them
+    :param progress: a function called with every run, None for no report
+    :return: a dictionary with the profile, the environment and the runs
+    """
+    profile = PROFILES[profile_name]
+    runs = []
+    for problem_name, parameters in profile['problems'].items():
+        if problems is not None and problem_name not in problems:
+            continue
+        for index in range(profile['instances']):
+            problem = generate(problem_name, index, seed, **parameters)
+            informed = has_heuristic(problem)
+            for name, factory, needs_heuristic in STRATEGIES:
+                if (strategies is not None and name not in strategies) or (needs_heuristic and not informed):
+                    continue
+                run = measure(problem, name, factory, profile, seed)
+                run['instance'] = f'{problem_name}-{index}'
+                runs.append(run)
+                if progress is not None:
+                    progress(run)
+    return {'profile': profile_name,
+            'seed': seed,
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'runs': runs}
+
+
+def save(benchmark, path):
+    with open(path, 'w') as file:
+        json.dump(benchmark, file, indent=1)
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(baseline, current, tolerance=TOLERANCE, min_time=MIN_TIME, min_memory=MIN_MEMORY):
+    """
+    Compare a benchmark with a baseline of the same profile and seed. The counters are deterministic, so any
+    increase is a regression, and so is an increase of the peak memory beyond the tolerance. The time depends on
+    the load of the machine: its increases beyond the tolerance are only warnings.
+    :param baseline: the benchmark of reference
+    :param current: the new benchmark
+    :param tolerance: the relative increase of time and peak memory reported
+    :param min_time: the time differences in seconds always ignored
+    :param min_memory: the peak memory differences in bytes always ignored
+    :return: the list of the regressions and the list of the warnings, both of
+    (instance, strategy, measure, baseline value, current value)
+    """
+    if (baseline['profile'], baseline['seed']) != (current['profile'], current['seed']):
+        raise ValueError('The baseline was run with a different profile or seed')
+    previous = {(run['instance'], run['strategy']): run for run in baseline['runs']}
+    regressions = []
+    warnings = []
+    for run in current['runs']:
+        old = previous.get((run['instance'], run['strategy']))
+        if old is None:
+            continue
+        key = (run['instance'], run['strategy'])
+        if old['result'] != run['result']:
+            # a search that stops finding the goal, hits the limit or raises an error
+            if run['result'] != 'Ok' and not old['result'].startswith('Error'):
+                regressions.append(key + ('result', old['result'], run['result']))
+            continue
+        if run['result'].startswith('Error'):
+            continue
+        if old['result'] == 'Ok' and run['cost'] > old['cost'] + 1e-9:
+            regressions.append(key + ('cost', old['cost'], run['cost']))
+        for measure in ('expanded', 'generated'):
+            if run[measure] > old[measure]:
+                regressions.append(key + (measure, old[measure], run[measure]))
+        if run['peak_memory'] > old['peak_memory'] * (1 + tolerance) and \
+                run['peak_memory'] - old['peak_memory'] > min_memory:
+            regressions.append(key + ('peak_memory', old['peak_memory'], run['peak_memory']))
+        if run['time'] > old['time'] * (1 + tolerance) and run['time'] - old['time'] > min_time:
+            warnings.append(key + ('time', old['time'], run['time']))
+    return regressions, warnings
+
+
+def report(run):
+    """
+    One line summary of a run
+    """
+    if run['result'].startswith('Error'):
+        return f"{run['instance']:<12} {run['strategy']:<18} {run['result']}"
+    cost = '-' if run['cost'] is None else f"{run['cost']:.4g}"
+    return (f"{run['instance']:<12} {run['strategy']:<18} {run['result']:<5} cost {cost:>8} "
+            f"expanded {run['expanded']:>7} time {run['time']:8.4f}s memory {run['peak_memory'] / 2 ** 20:8.2f} MB")
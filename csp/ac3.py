@@ -1,3 +1,6 @@
+from profiling.profiler import profiled
+
+
 class AC3:
     def __init__(self, csp):
         self.csp = csp
@@ -14,6 +17,7 @@ class AC3:
         neighbours = [arc for arc in self.all_arcs() if arc.variables[1] == var]
         queue.extend(neighbours)
 
+    @profiled
     def run(self, state):
         # initial queue with all the arcs in the problem
         queue = self.all_arcs()
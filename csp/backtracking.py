@@ -1,5 +1,7 @@
 import random
 
+from profiling.profiler import profiled
+
 
 def random_variable(problem, state):
     """
@@ -74,6 +76,7 @@ class BackTracking:
             value_criterion = random_assignment
         self.value_criterion = value_criterion
 
+    @profiled
     def run(self, state):
         # check if the state is the goal state
         if self.problem.goal_test(state):
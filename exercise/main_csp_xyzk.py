@@ -2,6 +2,9 @@ from csp.ac3 import AC3
 from csp.backtracking import *
 from csp.contraints import Constraint
 from csp.problem import CSP
+from profiling.profiler import enable_from_arguments
+
+enable_from_arguments()
 
 variables = ['X', 'Y', 'Z', 'K']
 domains = {
@@ -1,5 +1,8 @@
 from game.games import Forza4
 from game.search import *
+from profiling.profiler import enable_from_arguments
+
+enable_from_arguments()
 
 game = Forza4()
 player1 = Random(game=game)
@@ -1,5 +1,8 @@
 from game.games import JumpingFrogsGame
 from game.search import *
+from profiling.profiler import enable_from_arguments
+
+enable_from_arguments()
 
 game = JumpingFrogsGame(N=2)
 player1 = Random(game=game)
@@ -1,5 +1,8 @@
 from game.games import TicTacToe
 from game.search import *
+from profiling.profiler import enable_from_arguments
+
+enable_from_arguments()
 
 game = TicTacToe()
 player1 = Random(game=game)
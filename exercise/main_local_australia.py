@@ -1,6 +1,9 @@
+from profiling.profiler import enable_from_arguments
 from search.problem import AustraliaProblem
 from search.local_search import *
 
+enable_from_arguments()
+
 nodes = ['WA', 'NT', 'Q', 'NSW', 'V', 'SA', 'T']
 colors = ['r', 'g', 'b']
 
@@ -0,0 +1,26 @@
+import numpy as np
+
+from profiling.profiler import enable_from_arguments
+from search.anytime import AnytimeAStar
+from search.problem import *
+from input.grid import OccupancyGrid
+
+enable_from_arguments()
+
+# load the environment: a random map with 35% of obstacles
+occupancy = np.random.default_rng(13).random((600, 600)) < 0.35
+occupancy[0, 0] = occupancy[-1, -1] = False
+grid = OccupancyGrid(occupancy)
+
+# formulate the problem
+initial_state = (0, 0)
+goal_state = (599, 599)
+grid_problem = GridProblem(environment=grid,
+                           initial_state=initial_state,
+                           goal_state=goal_state)
+
+# anytime search: better and better solutions until the time budget is over
+search = AnytimeAStar(problem=grid_problem, weight=3)
+for node, bound in search.solutions(budget=3):
+    print("Path cost: " + str(node.cost) + ", at most " + str(bound) + " times the optimal one")
+print("Expanded: " + str(search.expanded))
@@ -0,0 +1,24 @@
+import os
+
+from profiling.profiler import enable_from_arguments
+from search.external_bfs import ExternalBreadthFirst
+from search.problem import *
+
+enable_from_arguments()
+
+random.seed(13)
+
+# formulate the problem
+pancake_problem = PancakeProblem(initial_state=tuple(random.sample(range(10), 10)))
+
+# search algorithm: the layers are kept on disk, run it again to resume an interrupted search
+search = ExternalBreadthFirst(problem=pancake_problem, directory=os.path.join('input', 'bfs'))
+result, node = search.run()
+
+# display the solutions
+print("Result: " + result)
+print("Goal: " + str(node.state))
+print("Path: " + str(node.path()))
+print("Path cost: " + str(node.cost))
+print("Layers:")
+print(search.histogram())
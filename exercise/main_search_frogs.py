@@ -1,8 +1,11 @@
+from profiling.profiler import enable_from_arguments
 from search.local_search import *
 from search.problem import *
 from search.strategies import *
 from search.tree_search import TreeSearch
 
+enable_from_arguments()
+
 random.seed(13)
 
 # formulate the problem
@@ -1,8 +1,11 @@
+from profiling.profiler import enable_from_arguments
 from search.problem import *
 from search.strategies import *
 from search.tree_search import TreeSearch
 from input.grid import Grid
 
+enable_from_arguments()
+
 random.seed(13)
 
 # load the environment
@@ -23,7 +26,7 @@ for strategy in strategies:
     search = TreeSearch(problem=grid_problem, strategy=strategy)
 
     # run algorithm
-    result, node = search.recursive_run()
+    result, node = search.run()
 
     # display the solutions
     print("Result: " + result)
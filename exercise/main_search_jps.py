@@ -0,0 +1,38 @@
+from profiling.profiler import enable_from_arguments
+from search.jump_point import JumpPointSearch
+from search.problem import *
+from search.stats import SearchStats
+from search.strategies import *
+from search.tree_search import TreeSearch
+from input.grid import Grid
+
+enable_from_arguments()
+
+random.seed(13)
+
+# random obstacle maps of increasing density on the 100x100 area of Grid
+for density in [0.0, 0.05, 0.1, 0.2, 0.3]:
+    grid = Grid()
+    grid.obstacles = {(x, y) for x in range(100) for y in range(100) if random.random() < density}
+
+    # formulate the problem
+    initial_state = (0, 0)
+    goal_state = (99, 99)
+    grid.obstacles -= {initial_state, goal_state}
+    grid_problem = GridProblem(environment=grid,
+                               initial_state=initial_state,
+                               goal_state=goal_state)
+
+    # A* expanding every cell
+    stats = SearchStats(timing=False)
+    result, node = TreeSearch(problem=grid_problem, strategy=AStar(problem=grid_problem), stats=stats).run()
+
+    # Jump Point Search expanding the jump points only
+    jps = JumpPointSearch(problem=grid_problem)
+    jps_result, jps_node = jps.run()
+
+    # display the solutions
+    print("Density: " + str(density))
+    print("Result: " + result + " / " + jps_result)
+    print("Path cost: " + str(node.cost) + " / " + str(jps_node.cost))
+    print("Expanded: " + str(stats.expanded) + " / " + str(jps.expanded))
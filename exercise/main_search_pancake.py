@@ -1,21 +1,25 @@
+from profiling.profiler import enable_from_arguments
+from search.permutation import PermutationSet
 from search.problem import *
 from search.strategies import *
 from search.tree_search import TreeSearch
 
+enable_from_arguments()
 
 # formulate the problem
 initial_state = (2, 1, 4, 6, 3, 5)
 pancake_problem = PancakeProblem(initial_state=initial_state)
 
-# search strategy
-strategies = [GraphBreadthFirst()]
+# search strategy: the visited stacks can be kept in a bitset indexed by the rank of the permutation
+strategies = [GraphBreadthFirst(),
+              GraphBreadthFirst(visited=PermutationSet(pancake_problem.goal_state))]
 
 # search algorithm (Tree Search / Graph Search)
 for strategy in strategies:
     search = TreeSearch(problem=pancake_problem, strategy=strategy)
 
     # run algorithm
-    result, node = search.recursive_run()
+    result, node = search.run()
 
     # display the solutions
     print("Result: " + result)
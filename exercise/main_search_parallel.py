@@ -0,0 +1,32 @@
+from profiling.profiler import enable_from_arguments
+from search.parallel import HashDistributedSearch
+from search.problem import *
+from search.strategies import *
+
+if __name__ == '__main__':
+    enable_from_arguments()
+
+    random.seed(13)
+
+    # formulate the problem: a random walk from the goal
+    tiles_problem = TilesProblem(initial_state=None, size=3)
+    state = tiles_problem.goal_state
+    for _ in range(200):
+        state = tiles_problem.result(state, random.choice(tiles_problem.actions(state)))
+    tiles_problem.initial_state = state
+
+    # search strategy
+    strategies = [AStar(problem=tiles_problem), GraphUniformCost()]
+
+    # search algorithm: the states are distributed among the worker processes
+    for strategy in strategies:
+        search = HashDistributedSearch(problem=tiles_problem, strategy=strategy, workers=4)
+
+        # run algorithm
+        result, node = search.run()
+
+        # display the solutions
+        print("Result: " + result)
+        print("Path: " + str(node.path()))
+        print("Path cost: " + str(node.cost))
+        print("Expanded per worker: " + str(search.expanded))
@@ -0,0 +1,31 @@
+from profiling.profiler import enable_from_arguments
+from search.portfolio import Portfolio
+from search.problem import *
+from search.strategies import *
+
+if __name__ == '__main__':
+    enable_from_arguments()
+
+    # formulate the problem
+    tiles_problem = EightTilesProblem(initial_state=(8, 6, 7, 2, 5, 4, 3, 0, 1))
+
+    # configurations of the portfolio: strategies and random seeds
+    configurations = [('GraphBreadthFirst', GraphBreadthFirst()),
+                      ('AStar', AStar(problem=tiles_problem)),
+                      ('Greedy', Greedy(problem=tiles_problem)),
+                      ('GraphRandom-1', GraphRandom(), 1),
+                      ('GraphRandom-2', GraphRandom(), 2)]
+
+    for mode in ['first', 'best']:
+        portfolio = Portfolio(problem=tiles_problem, configurations=configurations, timeout=20, mode=mode)
+
+        # run algorithm
+        result, node = portfolio.run()
+
+        # display the solutions
+        print(f'Mode: {mode}')
+        print("Result: " + result)
+        print("Winner: " + str(portfolio.winner))
+        print("Path cost: " + str(node.cost))
+        for name, (name_result, cost, elapsed) in portfolio.results.items():
+            print(f'\t{name}: {name_result}, cost {cost}, {elapsed:.2f}s')
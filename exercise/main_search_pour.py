@@ -1,7 +1,9 @@
+from profiling.profiler import enable_from_arguments
 from search.problem import *
 from search.strategies import *
 from search.tree_search import TreeSearch
 
+enable_from_arguments()
 
 # formulate the problem
 initial_state = (0,0,0)
@@ -20,7 +22,7 @@ for strategy in strategies:
     search = TreeSearch(problem=pour_problem, strategy=strategy)
 
     # run algorithm
-    result, node = search.recursive_run()
+    result, node = search.run()
 
     # display the solutions
     print("Result: " + result)
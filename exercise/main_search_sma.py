@@ -0,0 +1,26 @@
+from profiling.profiler import enable_from_arguments
+from search.memory_bounded import SMAStar
+from search.problem import *
+
+enable_from_arguments()
+
+random.seed(12)
+
+# formulate the problem: a random walk from the goal
+tiles_problem = TilesProblem(initial_state=None, size=3)
+state = tiles_problem.goal_state
+for _ in range(400):
+    state = tiles_problem.result(state, random.choice(tiles_problem.actions(state)))
+tiles_problem.initial_state = state
+
+# memory-bounded search: fewer nodes in memory, more nodes expanded
+for max_nodes in [20000, 5000, 2000]:
+    search = SMAStar(problem=tiles_problem, max_nodes=max_nodes)
+    result, node = search.run()
+
+    # display the solutions
+    print("Max nodes: " + str(max_nodes))
+    print("Result: " + result)
+    print("Path cost: " + str(node.cost))
+    print("Peak nodes: " + str(search.peak))
+    print("Expanded: " + str(search.expanded) + ", forgotten: " + str(search.dropped))
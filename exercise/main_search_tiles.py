@@ -0,0 +1,44 @@
+import os
+
+from profiling.profiler import enable_from_arguments
+from search.pattern_database import *
+from search.problem import *
+from search.strategies import *
+from search.tree_search import TreeSearch
+
+enable_from_arguments()
+
+random.seed(13)
+
+# pattern databases are built once and then memory-mapped from disk
+pdb_directory = os.path.join('input', 'pdb')
+
+for size, moves in [(3, 40), (4, 60)]:
+    try:
+        pdb = load_additive_pattern_database(pdb_directory, size)
+    except FileNotFoundError:
+        build_additive_pattern_database(size).save(pdb_directory)
+        pdb = load_additive_pattern_database(pdb_directory, size)
+
+    # formulate the problem: a random walk from the goal
+    tiles_problem = TilesProblem(initial_state=None, size=size, pdb=pdb)
+    state = tiles_problem.goal_state
+    for _ in range(moves):
+        state = tiles_problem.result(state, random.choice(tiles_problem.actions(state)))
+    tiles_problem.initial_state = state
+
+    # search strategy
+    strategies = [AStar(problem=tiles_problem)]
+
+    # search algorithm (Tree Search / Graph Search)
+    for strategy in strategies:
+        search = TreeSearch(problem=tiles_problem, strategy=strategy)
+
+        # run algorithm
+        result, node = search.run()
+
+        # display the solutions
+        print("Result: " + result)
+        print("Initial: " + str(tiles_problem.initial_state))
+        print("Path: " + str(node.path()))
+        print("Path cost: " + str(node.cost))
@@ -1,9 +1,12 @@
 import numpy as np
 
+from profiling.profiler import enable_from_arguments
 from search.problem import VacuumWorldProblem
 from search.strategies import *
 from search.tree_search import TreeSearch
 
+enable_from_arguments()
+
 n = 3
 initial_state = tuple(np.ones((n, n)).flatten())
 goal_state = tuple(np.zeros((n, n)).flatten())
@@ -18,7 +21,7 @@ for strategy in strategies:
     search = TreeSearch(problem=problem, strategy=strategy)
 
     # run algorithm
-    result, node = search.recursive_run()
+    result, node = search.run()
 
     # display the solutions
     print("Result: " + result)
@@ -1,6 +1,8 @@
 import random
 import numpy as np
 
+from profiling.profiler import profiled
+
 
 class Minimax:
 
@@ -29,6 +31,7 @@ class Minimax:
         values = [self.max_value(s) for s, a in self.game.successors(state)]
         return min(values)
 
+    @profiled
     def next_move(self, state):
         """
         Compute the final move suggested to the player MAX
@@ -90,6 +93,7 @@ class AlphaBeta:
             beta = min(beta, best_value)
         return best_value
 
+    @profiled
     def next_move(self, state):
         """
         Compute the final move suggested to the player MAX
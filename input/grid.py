@@ -1,14 +1,25 @@
 import math
+import os
 from random import randrange
 
+import numpy as np
+
+# characters of the free cells in the MovingAI .map files, all the others are obstacles
+MAP_FREE = '.GS'
+
 
 class Grid:
-    def __init__(self):
+    def __init__(self, n=10, size=100):
         # pick N random cells as obstacles
         obstacles = []
-        for _ in range(10):
-            obstacles.append((randrange(100), randrange(100)))
+        for _ in range(n):
+            obstacles.append((randrange(size), randrange(size)))
         self.obstacles = set(obstacles)
+        # the grid has no border
+        self.bounds = None
+
+    def is_free(self, x, y):
+        return (x, y) not in self.obstacles
 
     def straight_line_distance(self, start, end):
         x_start, y_start = start
@@ -16,3 +27,101 @@ class Grid:
         return math.sqrt((x_start - x_end) ** 2 + abs(y_start - y_end) ** 2)
         # Manhattan Distance = | x_1 − x_2 | + | y_1 − y_2 |
         # return abs(x_start - x_end) + abs(y_start - y_end)
+
+
+class OccupancyGrid(Grid):
+    """
+    A bounded grid whose obstacles are the non-zero entries of a 2D NumPy array (bool or uint8), indexed as
+    occupancy[y, x]. The array can be a memory map, so large maps are read lazily from disk.
+    """
+
+    def __init__(self, occupancy):
+        # Grid.__init__ is not called: it draws a set of random obstacles, while here the obstacles are the
+        # occupancy array. There is no obstacles set, the cells are checked only through is_free and bounds.
+        self.occupancy = occupancy
+        self.height, self.width = occupancy.shape
+        self.bounds = (0, 0, self.width - 1, self.height - 1)
+
+    def is_free(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and not self.occupancy[y, x]
+
+    def save(self, path):
+        """
+        Save the occupancy array in a .npy file
+        :param path: path of the file
+        """
+        np.save(path, self.occupancy)
+
+
+def load_grid(path):
+    """
+    Load an OccupancyGrid from a MovingAI .map file, a PGM image (P2 or P5, the dark pixels are obstacles) or a
+    .npy file of the occupancy array, which is memory-mapped
+    :param path: path of the file
+    :return: an OccupancyGrid
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npy':
+        return OccupancyGrid(np.load(path, mmap_mode='r'))
+    if extension == '.map':
+        return OccupancyGrid(read_map(path))
+    if extension == '.pgm':
+        return OccupancyGrid(read_pgm(path))
+    raise ValueError(f'Unknown map format {extension}')
+
+
+def read_map(path):
+    """
+    Read a MovingAI .map file: a header with type, height and width followed by the line 'map' and the rows
+    :param path: path of the file
+    :return: a bool occupancy array
+    """
+    with open(path) as file:
+        header = {}
+        for line in file:
+            if line.strip() == 'map':
+                break
+            key, value = line.split()
+            header[key] = value
+        height, width = int(header['height']), int(header['width'])
+        rows = np.frombuffer(''.join(file.read().split()).encode(), dtype=np.uint8)
+    if len(rows) != height * width:
+        raise ValueError(f'Expected {height}x{width} cells in {path}, found {len(rows)}')
+    free = np.isin(rows, np.frombuffer(MAP_FREE.encode(), dtype=np.uint8))
+    return ~free.reshape(height, width)
+
+
+def read_pgm(path):
+    """
+    Read a PGM image, ASCII (P2) or binary (P5): the pixels darker than half of the maximum value are obstacles
+    :param path: path of the file
+    :return: a bool occupancy array
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    # the header is made of magic number, width, height and maximum value, with optional comments
+    fields = []
+    position = 0
+    while len(fields) < 4:
+        while data[position:position + 1].isspace():
+            position += 1
+        if data[position:position + 1] == b'#':
+            position = data.index(b'\n', position)
+            continue
+        end = position
+        while not data[end:end + 1].isspace():
+            end += 1
+        fields.append(data[position:end].decode())
+        position = end
+    magic, width, height, maximum = fields[0], int(fields[1]), int(fields[2]), int(fields[3])
+
+    if magic == 'P5':
+        # a single whitespace separates the header from the pixels
+        dtype = np.uint8 if maximum < 256 else np.dtype('>u2')
+        pixels = np.frombuffer(data, dtype=dtype, count=width * height, offset=position + 1)
+    elif magic == 'P2':
+        pixels = np.array(data[position:].split(), dtype=np.int64)
+    else:
+        raise ValueError(f'Unknown PGM format {magic}')
+    return pixels.reshape(height, width) < (maximum + 1) / 2
@@ -1,5 +1,10 @@
 import math
 
+import numpy as np
+
+# mean radius of the Earth in km
+EARTH_RADIUS = 6371.0
+
 # this example is very simplified, here the actions have the same name of the reached state.
 # alternative actions could be 'Andria': ['Go to Corato', 'Go to Trani'] but it is only a matter of implementation
 roads_small= {
@@ -34,15 +39,122 @@ roads_small_coords = {
 }
 
 
+def haversine(lat_a, long_a, lat_b, long_b):
+    """
+    Great-circle distance in km between two points given in degrees
+    """
+    lat_a, long_a, lat_b, long_b = map(math.radians, (lat_a, long_a, lat_b, long_b))
+    a = math.sin((lat_b - lat_a) / 2) ** 2 + math.cos(lat_a) * math.cos(lat_b) * math.sin((long_b - long_a) / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def haversine_array(lat_a, long_a, lat_b, long_b):
+    """
+    Great-circle distances in km between arrays of points given in degrees
+    """
+    lat_a, long_a, lat_b, long_b = map(np.radians, (lat_a, long_a, lat_b, long_b))
+    a = np.sin((lat_b - lat_a) / 2) ** 2 + np.cos(lat_a) * np.cos(lat_b) * np.sin((long_b - long_a) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+
 class Roads:
     def __init__(self, streets, coordinates):
         self.streets = streets
         self.coordinates = coordinates
+        # the streets can be travelled in both directions if every street appears in both adjacency lists
+        self.symmetric = all(start in streets.get(end, []) for start in streets for end in streets[start])
 
     def distance(self, start, end):
         lat_a, long_a = self.coordinates[start]
         lat_b, long_b = self.coordinates[end]
-        lat_diff = abs(lat_a - lat_b)*111
-        long_diff = abs(long_a - long_b)*111
-        return math.sqrt(lat_diff**2 + long_diff**2)
+        return haversine(lat_a, long_a, lat_b, long_b)
+
+    def edges(self):
+        """
+        Returns the adjacency lists with the length of the streets
+        :return: a dictionary city -> list of (city, distance)
+        """
+        return {city: [(next_city, self.distance(city, next_city)) for next_city in next_cities]
+                for city, next_cities in self.streets.items()}
+
+
+class CompiledRoads:
+    """
+    Roads compiled in arrays: the cities are integer ids and the streets are stored in compressed sparse row (CSR)
+    form, the streets leaving the city i are the entries indptr[i]..indptr[i + 1] of indices (the reached cities)
+    and of weights (their length). The streets entering a city are stored in the same form in reverse_indptr,
+    reverse_indices and reverse_edges (the index of the street in the forward arrays).
+    """
+
+    def __init__(self, names, coordinates, indptr, indices, weights):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.coordinates = coordinates
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+        # reverse streets: the forward streets sorted by reached city
+        sources = np.repeat(np.arange(len(names)), np.diff(indptr))
+        self.reverse_edges = np.argsort(indices, kind='stable')
+        self.reverse_indices = sources[self.reverse_edges]
+        self.reverse_indptr = np.concatenate([[0], np.cumsum(np.bincount(indices, minlength=len(names)))])
+
+        # the streets can be travelled in both directions if the set of streets equals the set of reversed streets
+        forward = np.sort(sources * len(names) + indices)
+        backward = np.sort(indices * len(names) + sources)
+        self.symmetric = bool(np.array_equal(forward, backward))
+        self.lists = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def csr_lists(self):
+        """
+        The CSR arrays as Python lists, faster than the NumPy arrays when they are read one element at a time
+        :return: indptr, indices, weights, reverse_indptr, reverse_indices and reverse_edges lists
+        """
+        if self.lists is None:
+            self.lists = (self.indptr.tolist(), self.indices.tolist(), self.weights.tolist(),
+                          self.reverse_indptr.tolist(), self.reverse_indices.tolist(), self.reverse_edges.tolist())
+        return self.lists
+
+    def distances_to(self, target):
+        """
+        Great-circle distance of every city from a city
+        :param target: id of a city
+        :return: an array of distances in km
+        """
+        lat, long = self.coordinates[target]
+        return haversine_array(self.coordinates[:, 0], self.coordinates[:, 1], lat, long)
+
+    def edges(self):
+        """
+        Returns the adjacency lists with the length of the streets
+        :return: a dictionary city id -> list of (city id, distance)
+        """
+        indptr, indices, weights = self.csr_lists()[:3]
+        return {city: list(zip(indices[indptr[city]:indptr[city + 1]], weights[indptr[city]:indptr[city + 1]]))
+                for city in range(len(self.names))}
+
+
+def compile_roads(roads):
+    """
+    Compile a Roads environment: integer ids for the cities, CSR adjacency arrays and the length of every street
+    computed at once with the haversine formula
+    :param roads: a Roads environment
+    :return: a CompiledRoads environment
+    """
+    names = list(dict.fromkeys(list(roads.streets) + list(roads.coordinates)))
+    ids = {name: i for i, name in enumerate(names)}
+
+    coordinates = np.array([roads.coordinates[name] for name in names], dtype=np.float64)
+    degrees = np.array([len(roads.streets.get(name, [])) for name in names], dtype=np.int64)
+    indptr = np.concatenate([[0], np.cumsum(degrees)])
+    indices = np.array([ids[next_city] for name in names for next_city in roads.streets.get(name, [])],
+                       dtype=np.int64)
+    sources = np.repeat(np.arange(len(names)), degrees)
+    weights = haversine_array(coordinates[sources, 0], coordinates[sources, 1],
+                              coordinates[indices, 0], coordinates[indices, 1])
+    return CompiledRoads(names, coordinates, indptr, indices, weights)
 
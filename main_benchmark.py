@@ -0,0 +1,35 @@
+import argparse
+import sys
+
+from benchmark.runner import PROFILES, TOLERANCE, compare, load, report, run_benchmark, save
+
+parser = argparse.ArgumentParser(description='Benchmark the search strategies on random instances of the problems')
+parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+parser.add_argument('--seed', type=int, default=0)
+parser.add_argument('--problems', nargs='*', help='names of the problems to run, all if not given')
+parser.add_argument('--strategies', nargs='*', help='names of the strategies to run, all if not given')
+parser.add_argument('--output', help='JSON file of the results, benchmark_<profile>.json by default')
+parser.add_argument('--baseline', help='JSON file of a previous benchmark to compare with')
+parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                    help='relative increase of time and memory reported')
+arguments = parser.parse_args()
+
+# run the benchmark
+benchmark = run_benchmark(profile_name=arguments.profile,
+                          seed=arguments.seed,
+                          problems=arguments.problems,
+                          strategies=arguments.strategies,
+                          progress=lambda run: print(report(run)))
+output = arguments.output or f'benchmark_{arguments.profile}.json'
+save(benchmark, output)
+print(f'Results: {output}')
+
+# compare with the baseline, failing if there are regressions (the slower times are only warnings)
+if arguments.baseline:
+    regressions, warnings = compare(load(arguments.baseline), benchmark, tolerance=arguments.tolerance)
+    for instance, strategy, measure, old, new in warnings:
+        print(f'Warning: {instance} {strategy} {measure} {old} -> {new}')
+    for instance, strategy, measure, old, new in regressions:
+        print(f'Regression: {instance} {strategy} {measure} {old} -> {new}')
+    print(f'Regressions: {len(regressions)}, warnings: {len(warnings)}')
+    sys.exit(1 if regressions else 0)
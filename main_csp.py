@@ -1,6 +1,9 @@
 from csp.problem import *
 from csp.backtracking import *
 from csp.contraints import DifferentValues
+from profiling.profiler import enable_from_arguments
+
+enable_from_arguments()
 
 map_vars = ['WA', 'NT', 'Q', 'NSW', 'V', 'SA', 'T']
 map_domains = {var: ['green', 'red', 'blue'] for var in map_vars}
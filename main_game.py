@@ -1,5 +1,8 @@
 from game.games import DummyGame
 from game.search import *
+from profiling.profiler import enable_from_arguments
+
+enable_from_arguments()
 
 dummy_game = DummyGame()
 first_player = Random(game=dummy_game)
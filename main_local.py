@@ -1,6 +1,9 @@
+from profiling.profiler import enable_from_arguments
 from search.problem import *
 from search.local_search import *
 
+enable_from_arguments()
+
 # formulate the problem
 problem = EightQueensProblem()
 
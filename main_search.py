@@ -1,9 +1,13 @@
 from pathlib import Path
 from input.roads import *
+from profiling.profiler import enable_from_arguments
 from search.problem import *
+from search.stats import SearchStats
 from search.strategies import *
 from search.tree_search import TreeSearch
 
+enable_from_arguments()
+
 # load the environment
 # streets = roads_small  # for uninformed search (no cost)
 streets = Roads(streets=roads_small, coordinates=roads_small_coords)
@@ -20,13 +24,15 @@ strategies = [GraphRandom()]
 
 # search algorithm (Tree Search / Graph Search)
 for strategy in strategies:
-    search = TreeSearch(problem=map_problem, strategy=strategy)
+    stats = SearchStats()
+    search = TreeSearch(problem=map_problem, strategy=strategy, stats=stats)
 
     # run algorithm
-    result, node = search.recursive_run()
+    result, node = search.run()
 
     # display the solutions
     print("Result: " + result)
     print("Goal: " + node.state)
     print("Path: " + str(node.path()))
     print("Path cost: " + str(node.cost))
+    print("Stats: " + str(stats))
@@ -0,0 +1,184 @@
+import collections
+import cProfile
+import functools
+import multiprocessing
+import os
+import sys
+import threading
+import tracemalloc
+
+# Every main script calls enable_from_arguments(): run it with --profiling (or PROFILING=1 in the environment) to
+# profile the decorated searches, with --profiling-memory to add the allocation sites. The files are written in
+# PROFILING_DIR, 'profiles' by default.
+
+# the profiler collecting in the process: cProfile traces one profiler at a time, the nested ones do nothing
+running = None
+# profilers of the decorated functions, accumulating the stats of all their calls
+profilers = {}
+
+
+def enabled():
+    """
+    Checks if the profiling is enabled by the PROFILING environment variable
+    """
+    return os.environ.get('PROFILING', '') not in ('', '0')
+
+
+def enable_from_arguments():
+    """
+    Enable the profiling if the script is run with --profiling (--profiling-memory also takes the tracemalloc
+    snapshots), removing the flags from the command line arguments. The flags set the environment variables,
+    so they are inherited by the worker processes.
+    """
+    if '--profiling-memory' in sys.argv:
+        sys.argv.remove('--profiling-memory')
+        os.environ['PROFILING'] = '1'
+        os.environ['PROFILING_MEMORY'] = '1'
+    if '--profiling' in sys.argv:
+        sys.argv.remove('--profiling')
+        os.environ['PROFILING'] = '1'
+
+
+def frame_name(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def folded_stack(frame):
+    """
+    Given the innermost frame of a thread returns its stack in the folded format of the flame graph tools: the
+    names of the functions from the outermost one, separated by semicolons. The frames of the profiler are left out.
+    """
+    names = []
+    while frame is not None:
+        if frame.f_code.co_filename != __file__:
+            names.append(frame_name(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler(threading.Thread):
+    """
+    Thread counting the stacks of another thread, sampled at regular intervals
+    """
+
+    def __init__(self, thread_id, interval, stacks):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = stacks
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[folded_stack(frame)] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class Profiler:
+    """
+    Context manager profiling the code it runs. On exit it writes in the directory:
+    - <name>.pstats, the deterministic cProfile stats (for pstats, snakeviz...);
+    - <name>.folded, the stacks sampled by a thread every interval seconds, one line per stack with its count
+      (for flamegraph.pl, speedscope, inferno...);
+    - <name>.memory.txt, with memory=True, the top allocation sites of a tracemalloc snapshot taken at the end.
+    A profiler can be entered several times, its stats accumulate and the files are written again every time.
+    A profiler entered while another one is running does nothing.
+    """
+
+    def __init__(self, name, directory=None, interval=0.005, memory=None, top=25):
+        """
+        :param name: the name of the files
+        :param directory: the directory of the files, PROFILING_DIR or 'profiles' if None
+        :param interval: the seconds between two samples of the stack
+        :param memory: True to take a tracemalloc snapshot, PROFILING_MEMORY if None
+        :param top: the number of allocation sites written
+        """
+        self.name = name
+        self.directory = directory or os.environ.get('PROFILING_DIR', 'profiles')
+        self.interval = interval
+        self.memory = memory if memory is not None else os.environ.get('PROFILING_MEMORY', '') not in ('', '0')
+        self.top = top
+        self.profile = cProfile.Profile()
+        self.stacks = collections.Counter()
+        self.sampler = None
+        self.active = False
+        self.tracing = False
+        self.paths = []
+
+    def __enter__(self):
+        global running
+        if running is not None:
+            return self
+        running = self
+        self.active = True
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+        self.sampler = StackSampler(threading.get_ident(), self.interval, self.stacks)
+        self.sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global running
+        if not self.active:
+            return False
+        self.profile.disable()
+        self.sampler.stop()
+        snapshot = tracemalloc.take_snapshot() if self.memory and tracemalloc.is_tracing() else None
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+        self.active = False
+        running = None
+        self.save(snapshot)
+        return False
+
+    def save(self, snapshot=None):
+        """
+        Write the files of the profile
+        :param snapshot: a tracemalloc snapshot, None to skip the allocation sites
+        :return: the paths of the files
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.name)
+        self.profile.dump_stats(base + '.pstats')
+        with open(base + '.folded', 'w') as file:
+            for stack, count in sorted(self.stacks.items()):
+                file.write(f'{stack} {count}\n')
+        self.paths = [base + '.pstats', base + '.folded']
+        if snapshot is not None:
+            # the allocations of tracemalloc, of the profiler and of the sampling thread are left out
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                               tracemalloc.Filter(False, threading.__file__),
+                                               tracemalloc.Filter(False, __file__)])
+            with open(base + '.memory.txt', 'w') as file:
+                for statistic in snapshot.statistics('lineno')[:self.top]:
+                    file.write(f'{statistic}\n')
+            self.paths.append(base + '.memory.txt')
+        return self.paths
+
+
+def profiled(function):
+    """
+    Decorator profiling the calls of a function when the profiling is enabled, in files named after the function
+    (and the process id in the worker processes). The recursive calls are profiled as part of the outer one.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if running is not None or not enabled():
+            return function(*args, **kwargs)
+        name = function.__qualname__
+        if multiprocessing.parent_process() is not None:
+            name += f'-{os.getpid()}'
+        if name not in profilers:
+            profilers[name] = Profiler(name)
+        with profilers[name]:
+            return function(*args, **kwargs)
+    return wrapper
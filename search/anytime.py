@@ -0,0 +1,141 @@
+import heapq
+import itertools
+import math
+import time
+
+from profiling.profiler import profiled
+from search.node import Node, follow_actions
+
+
+class AnytimeAStar:
+    """
+    Anytime Repairing A* (ARA*): a sequence of weighted A* searches with f(n) = g(n) + w * h(n) and decreasing w.
+    The first search finds a solution quickly, the next ones improve it reusing the costs already found: only the
+    states whose cost decreased after their expansion (the inconsistent ones) are expanded again.
+    Every solution comes with a bound on its suboptimality: its cost is at most bound times the optimal one.
+    The heuristic of the problem must be consistent.
+    """
+
+    def __init__(self, problem, weight=2.5, decrement=0.5):
+        """
+        :param problem: the problem
+        :param weight: the weight of the first search
+        :param decrement: the decrease of the weight after every solution
+        """
+        self.problem = problem
+        self.initial_weight = weight
+        self.decrement = decrement
+        self.weight = weight
+        # bound of the last solution and number of expanded states
+        self.bound = math.inf
+        self.expanded = 0
+
+    def key(self, state, cost):
+        return cost + self.weight * self.problem.h(state)
+
+    def solutions(self, budget=None):
+        """
+        Run the searches until the optimal solution is found or the time is over
+        :param budget: the wall-clock time in seconds, None for no limit
+        :return: a generator of (node, bound), each solution with a lower cost or a lower bound than the previous one
+        """
+        deadline = None if budget is None else time.perf_counter() + budget
+        initial_state = self.problem.initial_state
+        self.weight = self.initial_weight
+        self.expanded = 0
+        root = Node(state=initial_state,
+                    parent=None,
+                    action=None,
+                    cost=0,
+                    depth=0)
+        if self.problem.goal_test(initial_state):
+            self.bound = 1
+            yield root, self.bound
+            return
+
+        # best cost g(n) and (previous state, action) of every reached state
+        g = {initial_state: 0}
+        parents = {initial_state: None}
+        counter = itertools.count()
+        fringe = [(self.key(initial_state, 0), next(counter), 0, initial_state)]
+        visited = set()
+        # visited states reached again with a lower cost, expanded by the next search
+        inconsistent = set()
+        goal_state, best_cost = None, math.inf
+        reported = None
+
+        while True:
+            while fringe:
+                key, _, cost, state = fringe[0]
+                if cost > g[state] or state in visited:
+                    heapq.heappop(fringe)
+                    continue
+                if best_cost <= key:
+                    break
+                if deadline is not None and time.perf_counter() > deadline:
+                    return
+                heapq.heappop(fringe)
+                visited.add(state)
+                self.expanded += 1
+
+                for next_state, action in self.problem.successors(state):
+                    new_cost = cost + self.problem.cost(state, action)
+                    if new_cost < g.get(next_state, math.inf):
+                        g[next_state] = new_cost
+                        parents[next_state] = (state, action)
+                        if self.problem.goal_test(next_state) and new_cost < best_cost:
+                            goal_state, best_cost = next_state, new_cost
+                        if next_state in visited:
+                            inconsistent.add(next_state)
+                        else:
+                            heapq.heappush(fringe, (self.key(next_state, new_cost), next(counter), new_cost,
+                                                    next_state))
+            if goal_state is None:
+                return
+
+            # states still to be expanded: no solution can cost less than their lowest g(n) + h(n)
+            pending = {state for _, _, cost, state in fringe if cost == g[state] and state not in visited}
+            pending |= inconsistent
+            lower_bound = min((g[state] + self.problem.h(state) for state in pending), default=math.inf)
+            self.bound = max(1, min(self.weight, best_cost / lower_bound if lower_bound > 0 else self.weight))
+            if reported != (best_cost, self.bound):
+                reported = (best_cost, self.bound)
+                yield self.solution(root, goal_state, parents), self.bound
+            if self.weight <= 1 or self.bound <= 1:
+                return
+
+            # next search: lower weight, the pending states are reordered and all the states can be expanded again
+            self.weight = max(1, self.weight - self.decrement)
+            fringe = [(self.key(state, g[state]), next(counter), g[state], state) for state in pending]
+            heapq.heapify(fringe)
+            visited.clear()
+            inconsistent.clear()
+
+    @profiled
+    def run(self, budget=None):
+        """
+        Run the searches and return the best solution found within the time budget
+        :param budget: the wall-clock time in seconds, None for no limit
+        :return: a path or a failure
+        """
+        node = None
+        for node, _ in self.solutions(budget):
+            pass
+        if node is None:
+            return 'Fail', []
+        return 'Ok', node
+
+    def solution(self, root, state, parents):
+        """
+        Build the solution node following the parents of a state back to the initial state
+        :param root: the node of the initial state
+        :param state: the goal state
+        :param parents: the (previous state, action) of every reached state
+        :return: the goal node
+        """
+        actions = []
+        while parents[state] is not None:
+            state, action = parents[state]
+            actions.append(action)
+
+        return follow_actions(self.problem, reversed(actions), root)
@@ -0,0 +1,125 @@
+import numpy as np
+
+from profiling.profiler import profiled
+from search.node import Node, follow_actions
+
+
+class RowCodec:
+    """
+    Converts the rows of an array of states in keys that can be sorted and compared: an unsigned 64 bits integer
+    packing the row in base radix when it fits, the raw bytes of the row otherwise
+    """
+
+    def __init__(self, width, radix, dtype):
+        self.width = width
+        self.radix = radix
+        self.dtype = np.dtype(dtype)
+        self.packed = radix ** width <= 2 ** 64
+        if self.packed:
+            self.powers = np.array([radix ** i for i in range(width)], dtype=np.uint64)
+            self.key_dtype = np.dtype(np.uint64)
+        else:
+            self.key_dtype = np.dtype((np.void, self.dtype.itemsize * width))
+
+    def encode(self, rows):
+        """
+        Given an array of states returns their keys
+        :param rows: an array of states, one per row
+        :return: an array of keys
+        """
+        if self.packed:
+            return (rows.astype(np.uint64) * self.powers).sum(axis=1, dtype=np.uint64)
+        return np.ascontiguousarray(rows, dtype=self.dtype).view(self.key_dtype).ravel()
+
+    def decode(self, keys):
+        """
+        Given an array of keys returns the states
+        :param keys: an array of keys
+        :return: an array of states, one per row
+        """
+        if self.packed:
+            return ((keys[:, None] // self.powers) % np.uint64(self.radix)).astype(self.dtype)
+        return keys.view(self.dtype).reshape(-1, self.width)
+
+
+def codec_for(problem):
+    """
+    Build the codec of the states of a problem supporting the batch expansion
+    :param problem: a problem
+    :return: a RowCodec
+    """
+    rows = problem.to_array([problem.initial_state, problem.goal_state])
+    return RowCodec(width=rows.shape[1], radix=int(rows.max()) + 1, dtype=rows.dtype)
+
+
+class LayeredBreadthFirst:
+    """
+    Breadth-first graph search expanding a whole layer of states at once. The problem must provide to_array,
+    from_array, expand_batch and batch_action: the states of a layer are the rows of a NumPy array and the
+    duplicates are removed with np.unique and a search in the sorted array of the visited states.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.codec = codec_for(problem)
+        # number of new states of every layer
+        self.layers = []
+
+    @profiled
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        root = Node(state=self.problem.initial_state,
+                    parent=None,
+                    action=None,
+                    cost=0,
+                    depth=0)
+        if self.problem.goal_test(root.state):
+            return 'Ok', root
+
+        layer = self.problem.to_array([self.problem.initial_state])
+        goal_key = self.codec.encode(self.problem.to_array([self.problem.goal_state]))[0]
+        visited = self.codec.encode(layer)
+        self.layers = [1]
+        # for every layer the row of the parent and the action code of its states
+        history = []
+
+        while len(layer):
+            children, parents, actions, _ = self.problem.expand_batch(layer)
+            keys, first = np.unique(self.codec.encode(children), return_index=True)
+
+            # drop the states already visited
+            position = np.minimum(np.searchsorted(visited, keys), len(visited) - 1)
+            new = visited[position] != keys
+            keys, first = keys[new], first[new]
+
+            layer = children[first]
+            history.append((parents[first], actions[first]))
+            self.layers.append(len(layer))
+
+            goal = np.nonzero(keys == goal_key)[0]
+            if len(goal):
+                return 'Ok', self.solution(root, history, goal[0])
+
+            # both arrays are sorted: the merge keeps the visited states sorted
+            visited = np.concatenate([visited, keys])
+            visited.sort(kind='mergesort')
+
+        return 'Fail', []
+
+    def solution(self, root, history, index):
+        """
+        Build the solution node following the parents of the goal back to the initial state
+        :param root: the node of the initial state
+        :param history: parents and actions of every layer
+        :param index: row of the goal in the last layer
+        :return: the goal node
+        """
+        actions = []
+        for parents, codes in reversed(history):
+            actions.append(self.problem.batch_action(codes[index]))
+            index = parents[index]
+
+        return follow_actions(self.problem, reversed(actions), root)
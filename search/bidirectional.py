@@ -0,0 +1,156 @@
+import copy
+import heapq
+import itertools
+import math
+
+from profiling.profiler import profiled
+from search.node import Node
+
+
+class BidirectionalSearch:
+    """
+    Bidirectional uniform cost search (or bidirectional A* when heuristic is True): a forward search from the
+    initial state and a backward search from the goal state run alternately until the best path joining them
+    cannot be improved anymore.
+    The backward search uses problem.predecessors(state), a list of (previous state, action) pairs, if the problem
+    defines it, otherwise the problem must declare that it is symmetric and the successors are used instead.
+    """
+
+    def __init__(self, problem, heuristic=False):
+        if not hasattr(problem, 'predecessors') and not getattr(problem, 'symmetric', False):
+            raise ValueError('The problem must define predecessors(state) or be symmetric')
+        self.problem = problem
+        self.heuristic = heuristic
+        # the heuristic of the backward search estimates the distance from the initial state
+        self.backward_problem = copy.copy(problem)
+        self.backward_problem.goal_state = problem.initial_state
+        self.expanded = 0
+
+    def forward_edges(self, state):
+        """
+        Given a state returns the next states with the cost and the action to reach them
+        :param state: a state
+        :return: a list of (state, cost, action)
+        """
+        return [(s, self.problem.cost(state, a), a) for s, a in self.problem.successors(state)]
+
+    def backward_edges(self, state):
+        """
+        Given a state returns the previous states with the cost and the action to come from them
+        :param state: a state
+        :return: a list of (state, cost, action), the action is None when it has to be found on the forward graph
+        """
+        if hasattr(self.problem, 'predecessors'):
+            return [(s, self.problem.cost(s, a), a) for s, a in self.problem.predecessors(state)]
+        # symmetric problem: every action can be undone with the same cost
+        return [(s, self.problem.cost(state, a), None) for s, a in self.problem.successors(state)]
+
+    @profiled
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        initial_state = self.problem.initial_state
+        goal_state = self.problem.goal_state
+        root = Node(state=initial_state,
+                    parent=None,
+                    action=None,
+                    cost=0,
+                    depth=0)
+        if initial_state == goal_state:
+            return 'Ok', root
+
+        # for each direction: fringe, best cost g(n), link (state, action) towards the origin and visited states
+        counter = itertools.count()
+        forward = ([(self.key(0, initial_state, self.problem), next(counter), 0, initial_state)],
+                   {initial_state: 0}, {initial_state: None}, set(), self.forward_edges, self.problem)
+        backward = ([(self.key(0, goal_state, self.backward_problem), next(counter), 0, goal_state)],
+                    {goal_state: 0}, {goal_state: None}, set(), self.backward_edges, self.backward_problem)
+
+        best_cost = math.inf
+        meeting_state = None
+        while True:
+            for fringe, g, _, visited, _, _ in (forward, backward):
+                # drop the nodes reached again with a lower cost or already visited
+                while fringe and (fringe[0][2] > g[fringe[0][3]] or fringe[0][3] in visited):
+                    heapq.heappop(fringe)
+            if not forward[0] or not backward[0]:
+                break
+
+            # stop when no path through the fringes can be cheaper than the best path found
+            forward_key, backward_key = forward[0][0][0], backward[0][0][0]
+            if self.heuristic and max(forward_key, backward_key) >= best_cost:
+                break
+            if not self.heuristic and forward_key + backward_key >= best_cost:
+                break
+
+            # expand the direction with the most promising node
+            this, other = (forward, backward) if forward_key <= backward_key else (backward, forward)
+            fringe, g, links, visited, edges, problem = this
+            _, _, cost, state = heapq.heappop(fringe)
+            visited.add(state)
+            self.expanded += 1
+
+            for new_state, step_cost, action in edges(state):
+                new_cost = cost + step_cost
+                if new_state in visited or new_cost >= g.get(new_state, math.inf):
+                    continue
+                g[new_state] = new_cost
+                links[new_state] = (state, action)
+                heapq.heappush(fringe, (self.key(new_cost, new_state, problem), next(counter), new_cost, new_state))
+
+                # a path joining the two searches
+                if new_state in other[1] and new_cost + other[1][new_state] < best_cost:
+                    best_cost = new_cost + other[1][new_state]
+                    meeting_state = new_state
+
+        if meeting_state is None:
+            return 'Fail', []
+        return 'Ok', self.join(root, forward[2], backward[2], meeting_state)
+
+    def key(self, cost, state, problem):
+        """
+        Priority of a node in the fringe of a direction
+        :param cost: the cost from the origin of the direction
+        :param state: a state
+        :param problem: the problem whose goal is the target of the direction
+        :return: g(n), or f(n) = g(n) + h(n) for bidirectional A*
+        """
+        if self.heuristic:
+            return cost + problem.h(state)
+        return cost
+
+    def join(self, root, forward_links, backward_links, meeting_state):
+        """
+        Build the solution node following the links of the two searches from the meeting state
+        :param root: the node of the initial state
+        :param forward_links: links of the forward search
+        :param backward_links: links of the backward search
+        :param meeting_state: the state where the two searches met
+        :return: the goal node
+        """
+        # forward part of the path, collected from the meeting state back to the initial state
+        steps = []
+        state = meeting_state
+        while forward_links[state] is not None:
+            previous_state, action = forward_links[state]
+            steps.append((state, action))
+            state = previous_state
+
+        node = root
+        for state, action in reversed(steps):
+            node = node.expand(state=state,
+                               action=action,
+                               cost=self.problem.cost(node.state, action))
+
+        # backward part of the path, from the meeting state to the goal state
+        state = meeting_state
+        while backward_links[state] is not None:
+            state, action = backward_links[state]
+            if action is None:
+                action = next(a for s, a in self.problem.successors(node.state) if s == state)
+            node = node.expand(state=state,
+                               action=action,
+                               cost=self.problem.cost(node.state, action))
+        return node
@@ -0,0 +1,272 @@
+import glob
+import json
+import os
+
+import numpy as np
+
+from profiling.profiler import profiled
+from search.batch_search import codec_for
+from search.node import follow_actions
+
+
+class SortedReader:
+    """
+    Sequential reader of a file of sorted keys, loading a block of keys at a time
+    """
+
+    def __init__(self, path, dtype, block_size):
+        self.file = open(path, 'rb')
+        self.dtype = dtype
+        self.block_size = block_size
+        self.block = self.read()
+
+    def read(self):
+        return np.fromfile(self.file, dtype=self.dtype, count=self.block_size)
+
+    def take(self, limit):
+        """
+        Read all the next keys up to a limit
+        :param limit: an array with the last key to read
+        :return: the sorted array of the keys lower than or equal to the limit
+        """
+        parts = []
+        while len(self.block):
+            end = int(np.searchsorted(self.block, limit, side='right')[0])
+            parts.append(self.block[:end])
+            if end < len(self.block):
+                self.block = self.block[end:]
+                break
+            self.block = self.read()
+        return np.concatenate(parts) if parts else np.empty(0, dtype=self.dtype)
+
+    def close(self):
+        self.file.close()
+
+
+class ExternalBreadthFirst:
+    """
+    Breadth-first graph search keeping the layers on disk, for state spaces whose visited states do not fit in
+    memory. The problem must support the batch expansion (to_array, from_array, expand_batch and batch_action).
+    Every layer is a file of the sorted keys of its states. The next layer is built in two passes:
+    - the layer is read in blocks and expanded, the keys of the children are sorted in memory by chunks and
+      written as sorted runs;
+    - the runs are merged a block at a time, and the keys already visited are removed reading in the same order
+      the last two layers, when every action can be undone, or the sorted file of all the visited keys, which is
+      then merged with the new layer.
+    A manifest records the completed layers, so an interrupted search resumes from the last one.
+    The path to the goal is rebuilt by expanding again the layers, from the last one back to the first.
+    """
+
+    def __init__(self, problem, directory, chunk_size=2 ** 22, block_size=2 ** 18):
+        """
+        :param problem: the problem
+        :param directory: the directory of the layer files
+        :param chunk_size: number of keys sorted in memory for every run
+        :param block_size: number of keys read at once from a file
+        """
+        self.problem = problem
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.block_size = block_size
+        self.codec = codec_for(problem)
+        # with reversible actions a state of the next layer can only be in the current or in the previous layer
+        self.reversible = hasattr(problem, 'inverse') or getattr(problem, 'symmetric', False)
+        # number of states of every layer and depth of the goal, None if not found
+        self.layers = []
+        self.goal_depth = None
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def layer_path(self, depth):
+        return self.path(f'layer_{depth:04d}.bin')
+
+    def visited_path(self, depth):
+        return self.path(f'visited_{depth:04d}.bin')
+
+    def encode(self, states):
+        return self.codec.encode(self.problem.to_array(states))
+
+    @profiled
+    def run(self):
+        """
+        Run the search, resuming a previous one found in the directory
+        :return: a path or a failure
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        initial_key = self.encode([self.problem.initial_state])
+        goal_key = self.encode([self.problem.goal_state])
+        if not self.resume(initial_key):
+            for name in glob.glob(self.path('layer_*.bin')) + glob.glob(self.path('visited_*.bin')):
+                os.remove(name)
+            initial_key.tofile(self.layer_path(0))
+            if not self.reversible:
+                initial_key.tofile(self.visited_path(0))
+            self.layers = [1]
+            self.goal_depth = 0 if self.problem.goal_test(self.problem.initial_state) else None
+            self.save_manifest(initial_key)
+
+        while self.goal_depth is None and self.layers[-1] > 0:
+            depth = len(self.layers) - 1
+            runs = self.sort_runs(depth)
+            if self.reversible:
+                seen = [self.layer_path(d) for d in (depth - 1, depth) if d >= 0]
+            else:
+                seen = [self.visited_path(depth)]
+            size, found = self.merge(runs, seen, self.layer_path(depth + 1), goal_key)
+            if not self.reversible:
+                self.merge([self.visited_path(depth), self.layer_path(depth + 1)], [], self.visited_path(depth + 1))
+            for run in runs:
+                os.remove(run)
+            self.layers.append(size)
+            if found:
+                self.goal_depth = depth + 1
+            self.save_manifest(initial_key)
+            if not self.reversible:
+                os.remove(self.visited_path(depth))
+
+        if self.goal_depth is None:
+            return 'Fail', []
+        return 'Ok', self.solution(goal_key)
+
+    def resume(self, initial_key):
+        """
+        Load the manifest of a previous search of the same problem and remove the files of an unfinished layer
+        :param initial_key: the key of the initial state
+        :return: True if the search can be resumed, False otherwise
+        """
+        for name in glob.glob(self.path('run_*.bin')) + glob.glob(self.path('*.tmp')):
+            os.remove(name)
+        try:
+            with open(self.path('manifest.json')) as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return False
+        if manifest['initial'] != initial_key.tobytes().hex() or manifest['dtype'] != str(self.codec.key_dtype):
+            return False
+        self.layers = manifest['layers']
+        self.goal_depth = manifest['goal_depth']
+        # the visited keys of a layer that was completed but not recorded in the manifest
+        for name in glob.glob(self.path('visited_*.bin')):
+            if name != self.visited_path(len(self.layers) - 1):
+                os.remove(name)
+        return True
+
+    def save_manifest(self, initial_key):
+        """
+        Write the manifest of the completed layers, replacing the previous one only when fully written
+        :param initial_key: the key of the initial state
+        """
+        manifest = {'initial': initial_key.tobytes().hex(),
+                    'dtype': str(self.codec.key_dtype),
+                    'layers': self.layers,
+                    'goal_depth': self.goal_depth}
+        with open(self.path('manifest.json.tmp'), 'w') as file:
+            json.dump(manifest, file)
+        os.replace(self.path('manifest.json.tmp'), self.path('manifest.json'))
+
+    def blocks(self, depth):
+        """
+        Read the keys of a layer a block at a time
+        :param depth: the depth of the layer
+        :return: a generator of arrays of keys
+        """
+        with open(self.layer_path(depth), 'rb') as file:
+            while True:
+                block = np.fromfile(file, dtype=self.codec.key_dtype, count=self.block_size)
+                if not len(block):
+                    return
+                yield block
+
+    def sort_runs(self, depth):
+        """
+        Expand a layer and write the keys of the children in sorted runs
+        :param depth: the depth of the layer
+        :return: the paths of the runs
+        """
+        runs = []
+        chunk, chunk_length = [], 0
+        for block in self.blocks(depth):
+            children = self.problem.expand_batch(self.codec.decode(block))[0]
+            keys = np.unique(self.codec.encode(children))
+            chunk.append(keys)
+            chunk_length += len(keys)
+            if chunk_length >= self.chunk_size:
+                runs.append(self.write_run(chunk, len(runs)))
+                chunk, chunk_length = [], 0
+        if chunk:
+            runs.append(self.write_run(chunk, len(runs)))
+        return runs
+
+    def write_run(self, chunk, index):
+        path = self.path(f'run_{index:04d}.bin')
+        np.unique(np.concatenate(chunk)).tofile(path)
+        return path
+
+    def merge(self, inputs, previous, output, goal_key=None):
+        """
+        Merge sorted files in a sorted file, removing the duplicates and the keys of other sorted files. All the
+        files are read sequentially, a block at a time.
+        :param inputs: the paths of the files to merge
+        :param previous: the paths of the files of the keys to remove
+        :param output: the path of the merged file
+        :param goal_key: an array with the key of the goal, None not to look for it
+        :return: the number of merged keys and True if they contain the goal
+        """
+        dtype = self.codec.key_dtype
+        readers = [SortedReader(path, dtype, self.block_size) for path in inputs]
+        seen = [SortedReader(path, dtype, self.block_size) for path in previous]
+        size, found = 0, False
+        with open(output + '.tmp', 'wb') as file:
+            while True:
+                active = [reader for reader in readers if len(reader.block)]
+                if not active:
+                    break
+                # all the keys up to the lowest last key of the blocks are in memory
+                limit = np.sort(np.array([reader.block[-1] for reader in active], dtype=dtype))[:1]
+                keys = np.unique(np.concatenate([reader.take(limit) for reader in active]))
+                for reader in seen:
+                    if not len(keys):
+                        break
+                    old = reader.take(keys[-1:])
+                    if len(old):
+                        position = np.minimum(np.searchsorted(old, keys), len(old) - 1)
+                        keys = keys[old[position] != keys]
+                if goal_key is not None:
+                    found = found or bool(np.any(keys == goal_key))
+                keys.tofile(file)
+                size += len(keys)
+        for reader in readers + seen:
+            reader.close()
+        os.replace(output + '.tmp', output)
+        return size, found
+
+    def solution(self, goal_key):
+        """
+        Build the solution node: for every layer from the last one, a state whose expansion gives the next state
+        of the path is found reading the layer again
+        :param goal_key: an array with the key of the goal
+        :return: the goal node
+        """
+        actions = []
+        target = goal_key
+        for depth in range(self.goal_depth - 1, -1, -1):
+            for block in self.blocks(depth):
+                children, parents, codes, _ = self.problem.expand_batch(self.codec.decode(block))
+                hits = np.nonzero(self.codec.encode(children) == target)[0]
+                if len(hits):
+                    actions.append(self.problem.batch_action(codes[hits[0]]))
+                    target = block[parents[hits[0]]:parents[hits[0]] + 1]
+                    break
+
+        return follow_actions(self.problem, reversed(actions))
+
+    def histogram(self, width=50):
+        """
+        Text histogram of the sizes of the layers
+        :param width: length of the longest bar
+        :return: a string with a line for every layer
+        """
+        largest = max(self.layers)
+        return '\n'.join(f'{depth:>4} {size:>12} ' + '#' * round(width * size / largest)
+                         for depth, size in enumerate(self.layers))
@@ -0,0 +1,159 @@
+import heapq
+import itertools
+from collections import deque
+
+
+class PriorityFringe:
+    """
+    A fringe backed by a binary heap. The priority of a node is computed once, when the node is pushed,
+    and nodes whose state has been visited in the meantime are discarded lazily when they reach the top.
+    Optionally the fringe keeps an index with the best known cost g(n) of every state: pushes that do not
+    improve it are skipped and an improving push supersedes the previous entry (lazy decrease-key), so at
+    most one live entry per state stays in the heap.
+    """
+
+    def __init__(self, key, visited=None, best_g=None, reopen=False):
+        self.key = key
+        self.visited = visited if visited is not None else set()
+        # dictionary state -> best known g(n), None to disable the bookkeeping
+        self.best_g = best_g
+        # move a visited state back into the fringe when a cheaper path to it is found
+        self.reopen = reopen
+        self.heap = []
+        # number of superseded entries still in the heap
+        self.superseded = 0
+        # number of duplicate nodes discarded
+        self.pruned = 0
+        # decreasing counter: among nodes with the same priority the last pushed is popped first
+        self.counter = itertools.count(0, -1)
+
+    def __len__(self):
+        self.prune()
+        return len(self.heap)
+
+    def extend(self, nodes):
+        """
+        Push the new nodes into the fringe, skipping the ones whose state has already been visited
+        :param nodes: a list of nodes
+        """
+        for node in nodes:
+            if self.best_g is not None:
+                if not self.improves(node):
+                    self.pruned += 1
+                    continue
+            elif node.state in self.visited:
+                self.pruned += 1
+                continue
+            heapq.heappush(self.heap, (self.key(node), next(self.counter), node))
+
+        # rebuild the heap when it is mostly made of superseded entries
+        if self.superseded > len(self.heap) // 2:
+            self.compact()
+
+    def improves(self, node):
+        """
+        Update the best known cost of the node state
+        :param node: a node
+        :return: True if the node has to be pushed, False if it is dominated
+        """
+        best = self.best_g.get(node.state)
+        if best is not None and node.cost >= best:
+            return False
+        if node.state in self.visited:
+            # the initial state has no recorded cost and cannot be improved
+            if best is None or not self.reopen:
+                return False
+            self.visited.discard(node.state)
+        elif best is not None:
+            self.superseded += 1
+        self.best_g[node.state] = node.cost
+        return True
+
+    def is_stale(self, node):
+        """
+        Checks if a node in the heap has to be discarded
+        :param node: a node
+        :return: True if the node state has been visited or reached with a lower cost, False otherwise
+        """
+        if self.best_g is not None and node.cost > self.best_g[node.state]:
+            self.superseded -= 1
+            return True
+        return node.state in self.visited
+
+    def compact(self):
+        """
+        Remove all the stale nodes from the heap
+        """
+        size = len(self.heap)
+        self.heap = [entry for entry in self.heap if not self.is_stale(entry[2])]
+        heapq.heapify(self.heap)
+        self.pruned += size - len(self.heap)
+        self.superseded = 0
+
+    def prune(self):
+        """
+        Remove from the top of the heap the nodes that became stale after they were pushed
+        """
+        while self.heap and self.is_stale(self.heap[0][2]):
+            heapq.heappop(self.heap)
+            self.pruned += 1
+
+    def pop(self):
+        """
+        Remove and return the node with the lowest priority value
+        :return: a node
+        """
+        self.prune()
+        return heapq.heappop(self.heap)[2]
+
+
+class DequeFringe:
+    """
+    A fringe backed by a deque. Nodes are inserted and removed in place: the fringe behaves as a stack (LIFO)
+    for the depth-first strategies and as a queue (FIFO) for the breadth-first ones.
+    """
+
+    def __init__(self, lifo=False, visited=None, limit=None):
+        self.lifo = lifo
+        self.visited = visited
+        self.limit = limit
+        self.nodes = deque()
+        # number of duplicate nodes discarded
+        self.pruned = 0
+
+    def __len__(self):
+        self.prune()
+        return len(self.nodes)
+
+    def extend(self, nodes):
+        """
+        Insert the new nodes into the fringe, skipping the ones already visited or deeper than the limit
+        :param nodes: a list of nodes
+        """
+        if self.visited is not None:
+            size = len(nodes)
+            nodes = [n for n in nodes if n.state not in self.visited]
+            self.pruned += size - len(nodes)
+        if self.limit is not None:
+            nodes = [n for n in nodes if n.depth <= self.limit]
+        if self.lifo:
+            self.nodes.extend(nodes)
+        else:
+            self.nodes.extendleft(reversed(nodes))
+
+    def prune(self):
+        """
+        Remove from the end of the fringe the nodes whose state has been visited after they were inserted
+        """
+        if self.visited is not None:
+            while self.nodes and self.nodes[-1].state in self.visited:
+                self.nodes.pop()
+                self.pruned += 1
+
+    def pop(self):
+        """
+        Remove and return the next node to explore
+        :return: a node
+        """
+        self.prune()
+        return self.nodes.pop()
@@ -0,0 +1,70 @@
+import copy
+from collections import OrderedDict
+
+
+class HeuristicCache:
+    """
+    Wraps a problem caching the values of its heuristic h(n), evicting the least recently used states when the
+    cache is full. Every other attribute is the one of the wrapped problem, so the wrapper can be given to
+    TreeSearch and to the strategies in place of the problem. Setting an attribute of the problem (e.g. goal_state)
+    sets it on the wrapped problem, and a new goal clears the cache.
+    """
+
+    def __init__(self, problem, maxsize=2 ** 20):
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # set last: from now on the attributes of the problem are set on it
+        self.problem = problem
+
+    def __getattr__(self, name):
+        # called only for the attributes not defined by the wrapper
+        if name == 'problem':
+            raise AttributeError(name)
+        return getattr(self.problem, name)
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__ or 'problem' not in self.__dict__ or not hasattr(self.problem, name):
+            super().__setattr__(name, value)
+            return
+        if name == 'goal_state' and value != self.problem.goal_state:
+            self.cache.clear()
+        setattr(self.problem, name, value)
+
+    def __copy__(self):
+        # a copy (e.g. the backward problem of BidirectionalSearch) wraps a copy of the problem with its own cache
+        return HeuristicCache(copy.copy(self.problem), self.maxsize)
+
+    def __repr__(self):
+        return f'HeuristicCache(size: {len(self.cache)}, hits: {self.hits}, misses: {self.misses})'
+
+    def h(self, state):
+        """
+        Given a state return the value of the heuristic, computing it only if the state is not in the cache
+        :param state: a state
+        :return: the heuristic value
+        """
+        try:
+            value = self.cache[state]
+        except KeyError:
+            self.misses += 1
+            value = self.cache[state] = self.problem.h(state)
+            if len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+            return value
+        self.hits += 1
+        self.cache.move_to_end(state)
+        return value
+
+    def bind(self, problem):
+        """
+        Wrap another problem keeping the cached values if it has the same goal, so that the cache is shared
+        by all the searches towards the same goal
+        :param problem: a problem
+        :return: the wrapper
+        """
+        if getattr(problem, 'goal_state', None) != getattr(self.problem, 'goal_state', None):
+            self.cache.clear()
+        self.problem = problem
+        return self
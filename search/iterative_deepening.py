@@ -0,0 +1,115 @@
+import math
+
+from profiling.profiler import profiled
+from search.node import Node
+
+
+class IterativeDeepening:
+    """
+    Iterative deepening depth-first search: a sequence of depth-first searches with an increasing depth limit.
+    Only the current branch and the siblings of its nodes are kept in memory.
+    """
+
+    def __init__(self, problem, max_bound=math.inf):
+        self.problem = problem
+        self.max_bound = max_bound
+        # bound and number of generated nodes of every iteration
+        self.bounds = []
+        self.generated = []
+
+    def value(self, node):
+        """
+        Value of a node compared against the bound of the iteration
+        :param node: a node
+        :return: the depth of the node
+        """
+        return node.depth
+
+    @profiled
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        root = Node(state=self.problem.initial_state,
+                    parent=None,
+                    action=None,
+                    cost=0,
+                    depth=0)
+
+        bound = self.value(root)
+        while bound <= self.max_bound:
+            node, next_bound = self.bounded_run(root, bound)
+            if node is not None:
+                return 'Ok', node
+            # no node exceeded the bound: the whole space has been explored
+            if next_bound == math.inf:
+                break
+            bound = next_bound
+        return 'Fail', []
+
+    def bounded_run(self, root, bound):
+        """
+        Run a depth-first search that does not expand the nodes exceeding the bound
+        :param root: the root node
+        :param bound: the bound of the iteration
+        :return: the goal node (or None) and the smallest value that exceeded the bound
+        """
+        self.bounds.append(bound)
+        self.generated.append(0)
+        next_bound = math.inf
+        stack = [root]
+
+        while stack:
+            node = stack.pop()
+            value = self.value(node)
+            if value > bound:
+                next_bound = min(next_bound, value)
+                continue
+
+            # check if the node passes the goal test
+            if self.problem.goal_test(node.state):
+                return node, next_bound
+
+            # expand the node, the first successor is the first to be explored
+            new_nodes = self.expand(node)
+            self.generated[-1] += len(new_nodes)
+            stack.extend(reversed(new_nodes))
+
+        return None, next_bound
+
+    def expand(self, node):
+        """
+        Given a node returns its children, except the one undoing the action that generated the node
+        :param node: a node
+        :return: a list of nodes
+        """
+        if node.parent is None:
+            new_states = self.problem.successors(node.state)
+        elif hasattr(self.problem, 'inverse'):
+            # do not even generate the state reached by undoing the last action
+            undo = self.problem.inverse(node.action)
+            new_states = [(self.problem.result(node.state, a), a)
+                          for a in self.problem.actions(node.state) if a != undo]
+        else:
+            new_states = [(s, a) for s, a in self.problem.successors(node.state)
+                          if s != node.parent.state]
+
+        return [node.expand(state=s,
+                            action=a,
+                            cost=self.problem.cost(node.state, a)) for s, a in new_states]
+
+
+class IterativeDeepeningAStar(IterativeDeepening):
+    """
+    Iterative deepening A* (IDA*): the bound of every depth-first iteration is on f(n) = g(n) + h(n)
+    and it grows to the smallest f(n) that exceeded the previous one.
+    """
+
+    def value(self, node):
+        """
+        Value of a node compared against the bound of the iteration
+        :param node: a node
+        :return: the estimated cost f(n) of the node
+        """
+        return node.cost + self.problem.h(node.state)
@@ -0,0 +1,202 @@
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+from profiling.profiler import profiled
+from search.node import follow_actions
+
+
+class JumpPointSearch:
+    """
+    Jump Point Search for GridProblem: an A* search on the 8-connected uniform-cost grid that expands only the
+    jump points. From a cell the search moves straight or diagonally, skipping the cells whose neighbours can be
+    reached at least as cheaply by a path not passing through them, and stops at the goal or at a cell next to an
+    obstacle (a cell with a forced neighbour). The path is optimal, and the cells between the jump points are
+    added back to the solution.
+    A Grid has no border, so the search is bounded to the box around the obstacles, the initial and the goal cell
+    plus a margin: a path leaving that box is never shorter than one following its border.
+    """
+
+    def __init__(self, problem, margin=1):
+        self.problem = problem
+        self.is_free = problem.environment.is_free
+        self.bounds = problem.environment.bounds
+        # the occupancy array of an OccupancyGrid, to check the straight moves with NumPy
+        self.occupancy = getattr(problem.environment, 'occupancy', None)
+        if self.bounds is None:
+            cells = set(problem.environment.obstacles) | {problem.initial_state, problem.goal_state}
+            xs = [x for x, _ in cells]
+            ys = [y for _, y in cells]
+            self.bounds = (min(xs) - margin, min(ys) - margin, max(xs) + margin, max(ys) + margin)
+        self.expanded = 0
+
+    def free(self, x, y):
+        """
+        Checks if a cell is inside the bounds and free from obstacles
+        """
+        min_x, min_y, max_x, max_y = self.bounds
+        return min_x <= x <= max_x and min_y <= y <= max_y and self.is_free(x, y)
+
+    def directions(self, state, parent):
+        """
+        Given a jump point and the previous one returns the directions to follow: the natural ones, that continue
+        the move, and the forced ones, around an adjacent obstacle
+        :param state: a cell
+        :param parent: the previous jump point, None for the initial cell
+        :return: a list of (dx, dy)
+        """
+        if parent is None:
+            return self.problem.directions
+        x, y = state
+        dx = (x > parent[0]) - (x < parent[0])
+        dy = (y > parent[1]) - (y < parent[1])
+        free = self.free
+        if dx and dy:
+            directions = [(dx, 0), (0, dy), (dx, dy)]
+            if not free(x - dx, y):
+                directions.append((-dx, dy))
+            if not free(x, y - dy):
+                directions.append((dx, -dy))
+        elif dx:
+            directions = [(dx, 0)]
+            if not free(x, y + 1):
+                directions.append((dx, 1))
+            if not free(x, y - 1):
+                directions.append((dx, -1))
+        else:
+            directions = [(0, dy)]
+            if not free(x + 1, y):
+                directions.append((1, dy))
+            if not free(x - 1, y):
+                directions.append((-1, dy))
+        return directions
+
+    def jump(self, state, dx, dy):
+        """
+        Move from a cell in a direction until a jump point is found
+        :param state: a cell
+        :param dx: horizontal direction
+        :param dy: vertical direction
+        :return: the jump point, None if the move ends on an obstacle or on the bounds
+        """
+        x, y = state
+        if self.occupancy is not None and not (dx and dy):
+            return self.scan(x, y, dx, dy)
+        free = self.free
+        goal = self.problem.goal_state
+        while True:
+            x, y = x + dx, y + dy
+            if not free(x, y):
+                return None
+            if (x, y) == goal:
+                return x, y
+            if dx and dy:
+                if (not free(x - dx, y) and free(x - dx, y + dy)) or (not free(x, y - dy) and free(x + dx, y - dy)):
+                    return x, y
+                # a diagonal move stops where a straight move would find a jump point
+                if self.jump((x, y), dx, 0) is not None or self.jump((x, y), 0, dy) is not None:
+                    return x, y
+            elif dx:
+                if (not free(x, y + 1) and free(x + dx, y + 1)) or (not free(x, y - 1) and free(x + dx, y - 1)):
+                    return x, y
+            else:
+                if (not free(x + 1, y) and free(x + 1, y + dy)) or (not free(x - 1, y) and free(x - 1, y + dy)):
+                    return x, y
+
+    def scan(self, x, y, dx, dy):
+        """
+        Straight move on an occupancy array: the whole line of cells and the two lines beside it are checked at once
+        :param x: x of the cell
+        :param y: y of the cell
+        :param dx: horizontal direction
+        :param dy: vertical direction
+        :return: the jump point, None if the move ends on an obstacle or on the bounds
+        """
+        # horizontal moves read the rows, vertical moves the columns: along is the coordinate that changes
+        grid, along, across, step = (self.occupancy, x, y, dx) if dx else (self.occupancy.T, y, x, dy)
+        goal_x, goal_y = self.problem.goal_state
+        goal_along, goal_across = (goal_x, goal_y) if dx else (goal_y, goal_x)
+
+        def line(row):
+            return np.asarray(grid[row, along + 1:] if step > 0 else grid[row, :along][::-1]) != 0
+
+        blocked = line(across)
+        stops = np.zeros(len(blocked), dtype=bool)
+        for row in (across - 1, across + 1):
+            if 0 <= row < grid.shape[0]:
+                # a forced neighbour: an obstacle beside the cell and a free cell beside the next one
+                side = line(row)
+                stops[:-1] |= side[:-1] & ~side[1:]
+        if goal_across == across and 0 < (goal_along - along) * step <= len(blocked):
+            stops[(goal_along - along) * step - 1] = True
+
+        first_stop = np.argmax(stops) if stops.any() else len(stops)
+        first_blocked = np.argmax(blocked) if blocked.any() else len(blocked)
+        if first_stop >= min(first_blocked, len(stops)):
+            return None
+        along += step * (int(first_stop) + 1)
+        return (along, across) if dx else (across, along)
+
+    @profiled
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        initial_state = self.problem.initial_state
+        distance = self.problem.environment.straight_line_distance
+        # best cost g(n) and previous jump point of every reached jump point
+        g = {initial_state: 0}
+        parents = {initial_state: None}
+        counter = itertools.count()
+        fringe = [(self.problem.h(initial_state), next(counter), 0, initial_state)]
+        visited = set()
+        self.expanded = 0
+
+        while fringe:
+            _, _, cost, state = heapq.heappop(fringe)
+            if state in visited or cost > g[state]:
+                continue
+            if self.problem.goal_test(state):
+                return 'Ok', self.solution(state, parents)
+            visited.add(state)
+            self.expanded += 1
+
+            for dx, dy in self.directions(state, parents[state]):
+                jump_point = self.jump(state, dx, dy)
+                if jump_point is None or jump_point in visited:
+                    continue
+                new_cost = cost + distance(state, jump_point)
+                if new_cost < g.get(jump_point, math.inf):
+                    g[jump_point] = new_cost
+                    parents[jump_point] = state
+                    heapq.heappush(fringe, (new_cost + self.problem.h(jump_point), next(counter), new_cost,
+                                            jump_point))
+
+        return 'Fail', []
+
+    def solution(self, state, parents):
+        """
+        Build the solution node from the jump points, adding the cells between them
+        :param state: the goal cell
+        :param parents: the previous jump point of every jump point
+        :return: the goal node
+        """
+        jump_points = []
+        while state is not None:
+            jump_points.append(state)
+            state = parents[state]
+        jump_points.reverse()
+
+        # the actions of GridProblem are the reached cells: the cells of the straight lines between the jump points
+        actions = []
+        x_start, y_start = jump_points[0]
+        for x, y in jump_points[1:]:
+            dx = (x > x_start) - (x < x_start)
+            dy = (y > y_start) - (y < y_start)
+            while (x_start, y_start) != (x, y):
+                x_start, y_start = x_start + dx, y_start + dy
+                actions.append((x_start, y_start))
+        return follow_actions(self.problem, actions)
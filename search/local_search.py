@@ -1,5 +1,7 @@
 import math
 import random
+
+from profiling.profiler import profiled
 from search.node import Node
 
 
@@ -8,6 +10,7 @@ class HillClimbing:
     def __init__(self, problem):
         self.problem = problem
 
+    @profiled
     def run(self):
         # initial node with initial state
         node = Node(state=self.problem.initial_state,
@@ -57,6 +60,7 @@ class SimulatedAnnealing:
         return initial_temp * math.exp(-self.lam * time)
     # ------------------------------------------------
 
+    @profiled
     def run(self, initial_temp=100):
         # set time at the beginning of the search
         time = 0
@@ -125,6 +129,7 @@ class Genetic:
         new_state[random.randrange(len(state))] = random.choice(self.gene_pool)
         return tuple(new_state)
 
+    @profiled
     def run(self):
         population = [self.problem.random() for _ in range(self.population)]
         for e in range(self.generations):
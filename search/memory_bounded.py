@@ -0,0 +1,190 @@
+import heapq
+import itertools
+import math
+
+from profiling.profiler import profiled
+from search.node import Node
+
+
+class MemoryNode(Node):
+    """
+    Node of the SMA* search tree: besides the path it keeps the children in memory, the backed-up f value and the
+    lowest f value of the forgotten children
+    """
+    __slots__ = ('f', 'children', 'forgotten', 'expanded', 'alive')
+
+    def __init__(self, state, parent, action, cost, depth, f):
+        super().__init__(state, parent, action, cost, depth)
+        self.f = f
+        self.children = []
+        self.forgotten = math.inf
+        self.expanded = False
+        self.alive = True
+
+
+class SMAStar:
+    """
+    Simplified memory-bounded A* (SMA*): an A* search keeping at most max_nodes nodes of the search tree in memory.
+    When the memory is full the leaf with the highest f value (the shallowest among equals) is forgotten and its
+    value is backed up to its parent, which is expanded again if the forgotten subtree becomes the most promising.
+    The f values use pathmax (a child is never better than its parent), so they never decrease along a path.
+    The solution is optimal if the optimal path fits in memory (it is not deeper than max_nodes - 1), otherwise
+    it is the best solution that fits.
+    Unlike the strategies, SMA* needs to regenerate forgotten nodes, so it runs its own loop as IterativeDeepening.
+    """
+
+    def __init__(self, problem, max_nodes):
+        if max_nodes < 2:
+            raise ValueError('At least two nodes must fit in memory')
+        self.problem = problem
+        self.max_nodes = max_nodes
+        # nodes in memory, their maximum, expanded nodes and forgotten nodes
+        self.used = 0
+        self.peak = 0
+        self.expanded = 0
+        self.dropped = 0
+        self.counter = itertools.count()
+        # candidates for expansion, ordered by f (deepest first), and leaves, ordered by highest f (shallowest
+        # first): the entries of the nodes that changed are left in the heaps and skipped when popped
+        self.fringe = []
+        self.leaves = []
+
+    @profiled
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        root = MemoryNode(state=self.problem.initial_state,
+                          parent=None,
+                          action=None,
+                          cost=0,
+                          depth=0,
+                          f=self.problem.h(self.problem.initial_state))
+        self.used = self.peak = 1
+        self.expanded = self.dropped = 0
+        self.fringe = []
+        self.leaves = []
+        self.push(root)
+
+        while self.fringe:
+            key, _, _, node = heapq.heappop(self.fringe)
+            if not node.alive or key != self.fringe_key(node):
+                continue
+            if key == math.inf:
+                break
+            if not node.expanded and self.problem.goal_test(node.state):
+                return 'Ok', node
+            self.expand(node)
+            # forget the worst leaves until the memory limit is respected
+            while self.used > self.max_nodes:
+                self.drop(self.worst_leaf())
+            if len(self.fringe) + len(self.leaves) > 4 * self.max_nodes:
+                self.compact()
+        return 'Fail', []
+
+    def fringe_key(self, node):
+        """
+        Key of a node in the fringe: its f value if never expanded, the best forgotten child otherwise
+        """
+        return node.forgotten if node.expanded else node.f
+
+    def push(self, node):
+        """
+        Add the entries of a node to the fringe and, if it is a leaf, to the leaves
+        """
+        heapq.heappush(self.fringe, (self.fringe_key(node), -node.depth, next(self.counter), node))
+        if not node.children and node.parent is not None:
+            heapq.heappush(self.leaves, (-node.f, node.depth, next(self.counter), node))
+
+    def compact(self):
+        """
+        Remove the entries of the forgotten or changed nodes from the heaps, so that their size is bounded too
+        """
+        fringe = {}
+        for entry in self.fringe:
+            node = entry[3]
+            if node.alive and entry[0] == self.fringe_key(node):
+                fringe.setdefault(id(node), entry)
+        leaves = {}
+        for entry in self.leaves:
+            node = entry[3]
+            if node.alive and not node.children and -entry[0] == node.f:
+                leaves.setdefault(id(node), entry)
+        self.fringe = list(fringe.values())
+        self.leaves = list(leaves.values())
+        heapq.heapify(self.fringe)
+        heapq.heapify(self.leaves)
+
+    def worst_leaf(self):
+        """
+        Pop the leaf with the highest f value
+        :return: a node
+        """
+        while True:
+            key, _, _, node = heapq.heappop(self.leaves)
+            if node.alive and not node.children and -key == node.f:
+                return node
+
+    def expand(self, node):
+        """
+        Generate the children of a node that are not in memory and back up the f value to the ancestors
+        :param node: a node
+        """
+        self.expanded += 1
+        ancestors = set()
+        ancestor = node
+        while ancestor is not None:
+            ancestors.add(ancestor.state)
+            ancestor = ancestor.parent
+        present = {child.state for child in node.children}
+
+        for state, action in self.problem.successors(node.state):
+            # the states of the path are skipped: a cycle is never part of the best path
+            if state in ancestors or state in present:
+                continue
+            cost = node.cost + self.problem.cost(node.state, action)
+            depth = node.depth + 1
+            if self.problem.goal_test(state) or depth < self.max_nodes - 1:
+                f = max(node.f, cost + self.problem.h(state))
+            else:
+                # no room left in memory for the path below the node
+                f = math.inf
+            child = MemoryNode(state=state, parent=node, action=action, cost=cost, depth=depth, f=f)
+            node.children.append(child)
+            self.used += 1
+            self.push(child)
+
+        node.expanded = True
+        node.forgotten = math.inf
+        self.peak = max(self.peak, self.used)
+        self.backup(node)
+
+    def backup(self, node):
+        """
+        Update the f value of a node and of its ancestors as the lowest f value of their children
+        :param node: a node
+        """
+        while node is not None:
+            f = min([child.f for child in node.children] + [node.forgotten])
+            if f == node.f:
+                return
+            node.f = f
+            if not node.children:
+                # a dead end: it is the first leaf to be forgotten
+                self.push(node)
+            node = node.parent
+
+    def drop(self, leaf):
+        """
+        Forget a leaf, keeping its f value in the parent
+        :param leaf: a node
+        """
+        leaf.alive = False
+        parent = leaf.parent
+        parent.children.remove(leaf)
+        parent.forgotten = min(parent.forgotten, leaf.f)
+        self.used -= 1
+        self.dropped += 1
+        # the parent must be expanded again to regenerate the forgotten child
+        self.push(parent)
@@ -1,4 +1,10 @@
+from array import array
+
+
 class Node:
+    # no instance dictionary: millions of nodes can be created during a search
+    __slots__ = ('state', 'parent', 'action', 'cost', 'depth')
+
     def __init__(self, state, parent, action, cost, depth):
         self.state = state
         self.parent = parent
@@ -39,3 +45,139 @@ class Node:
             node = node.parent
         path = list(reversed(path))
         return path
+
+
+def follow_actions(problem, actions, node=None):
+    """
+    Given a sequence of actions returns the node reached doing them one after the other
+    :param problem: the problem, giving the reached states and the costs of the actions
+    :param actions: an iterable of actions
+    :param node: the node the actions start from, a root node of the initial state if None
+    :return: the last node
+    """
+    if node is None:
+        node = Node(state=problem.initial_state,
+                    parent=None,
+                    action=None,
+                    cost=0,
+                    depth=0)
+    for action in actions:
+        node = node.expand(state=problem.result(node.state, action),
+                           action=action,
+                           cost=problem.cost(node.state, action))
+    return node
+
+
+class NodePool:
+    """
+    A compact alternative to Node objects: the nodes are stored in parallel arrays and referred to by their index.
+    Actions are stored once and the nodes keep their integer ids, the parent of a node is the index of the parent
+    node (-1 for a root). States are stored once as well when intern_states is True, which pays off when the same
+    states are reached many times (tree search); otherwise the state id of a node is its own index.
+    """
+
+    def __init__(self, intern_states=True):
+        self.intern_states = intern_states
+        self.state_ids = {}
+        self.states = []
+        self.action_ids = {}
+        self.actions = []
+        self.state = array('q')
+        self.parent = array('q')
+        self.action = array('q')
+        self.cost = array('d')
+        self.depth = array('q')
+
+    def __len__(self):
+        return len(self.state)
+
+    @staticmethod
+    def intern(value, ids, values):
+        """
+        Returns the id of a value, assigning a new id to the values never seen before
+        :param value: a value
+        :param ids: dictionary value -> id
+        :param values: list of the values indexed by id
+        :return: the id of the value
+        """
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = ids[value] = len(values)
+            values.append(value)
+        return value_id
+
+    def root(self, state):
+        """
+        Add a root node containing the given state
+        :param state: a state
+        :return: the index of the node
+        """
+        self.state.append(self.state_id(state))
+        self.parent.append(-1)
+        self.action.append(-1)
+        self.cost.append(0)
+        self.depth.append(0)
+        return len(self.state) - 1
+
+    def expand(self, index, state, action, cost=1):
+        """
+        Given a node and a new state adds a child node containing that state
+        :param index: index of the parent node
+        :param state: state that will be contained by the node
+        :param action: action that led to the state
+        :param cost: cost of the action
+        :return: the index of the child node
+        """
+        self.state.append(self.state_id(state))
+        self.parent.append(index)
+        self.action.append(self.intern(action, self.action_ids, self.actions))
+        self.cost.append(self.cost[index] + cost)
+        self.depth.append(self.depth[index] + 1)
+        return len(self.state) - 1
+
+    def state_id(self, state):
+        """
+        Returns the id of a state to be stored in a new node
+        :param state: a state
+        :return: the id of the state
+        """
+        if self.intern_states:
+            return self.intern(state, self.state_ids, self.states)
+        self.states.append(state)
+        return len(self.states) - 1
+
+    def get_state(self, index):
+        return self.states[self.state[index]]
+
+    def path(self, index):
+        """
+        Returns the path from the root node to the given node
+        :param index: index of a node
+        :return: a list of actions
+        """
+        path = []
+        while self.parent[index] >= 0:
+            path.append(self.actions[self.action[index]])
+            index = self.parent[index]
+        path = list(reversed(path))
+        return path
+
+    def to_node(self, index):
+        """
+        Converts a node of the pool into a Node linked to its ancestors
+        :param index: index of a node
+        :return: a Node
+        """
+        indices = []
+        while index >= 0:
+            indices.append(index)
+            index = self.parent[index]
+
+        node = None
+        for index in reversed(indices):
+            node = Node(state=self.get_state(index),
+                        parent=node,
+                        action=self.actions[self.action[index]] if node is not None else None,
+                        cost=self.cost[index],
+                        depth=self.depth[index])
+        return node
@@ -0,0 +1,278 @@
+import collections
+import heapq
+import json
+import math
+import os
+import random
+
+import numpy as np
+
+from input.roads import CompiledRoads, Roads, compile_roads
+
+# largest graph whose full distance matrix is built by default
+MAX_MATRIX = 1000
+
+
+class DistanceOracle:
+    """
+    Exact shortest path distances between the cities of a CompiledRoads environment, computed offline. The paths
+    are rebuilt from the distances: from a city the next one is the neighbour minimizing the length of the street
+    plus its distance from the target. Each oracle defines distance(source, target) and arrays(), the dictionary
+    of the arrays it saves.
+    """
+
+    kind = None
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.indptr, self.indices, self.weights = graph.csr_lists()[:3]
+
+    def path(self, source, target):
+        """
+        Shortest path between two cities
+        :param source: id of the initial city
+        :param target: id of the goal city
+        :return: the list of the ids of the reached cities, None if the target cannot be reached
+        """
+        if math.isinf(self.distance(source, target)):
+            return None
+        path = []
+        city = source
+        while city != target:
+            path.extend(self.next_cities(city, target))
+            city = path[-1]
+        return path
+
+    def next_cities(self, city, target):
+        """
+        Cities from a city to the first one closer to the target along a shortest path: a single neighbour, unless
+        the path crosses streets of zero length (e.g. two junctions with the same coordinates). The cities at the
+        same distance from the target linked by such streets are searched breadth first, so the walk cannot loop.
+        :param city: id of a city, not the target
+        :param target: id of the goal city
+        :return: the list of the ids of the reached cities
+        """
+        remaining = self.distance(city, target)
+        parents = {city: None}
+        queue = collections.deque([city])
+        while queue:
+            current = queue.popleft()
+            best = None
+            if current != target:
+                for edge in range(self.indptr[current], self.indptr[current + 1]):
+                    next_city = self.indices[edge]
+                    weight = self.weights[edge]
+                    next_remaining = self.distance(next_city, target)
+                    if next_remaining < remaining:
+                        # the closest neighbour along the street, the shortest street among equals
+                        if best is None or (weight + next_remaining, weight) < best[:2]:
+                            best = (weight + next_remaining, weight, next_city)
+                    elif weight == 0 and next_city not in parents and math.isclose(next_remaining, remaining,
+                                                                                   abs_tol=1e-9):
+                        parents[next_city] = current
+                        queue.append(next_city)
+                if best is None or not math.isclose(best[0], remaining, abs_tol=1e-9):
+                    continue
+            cities = [] if best is None else [best[2]]
+            while current != city:
+                cities.append(current)
+                current = parents[current]
+            return list(reversed(cities))
+        raise ValueError(f'The distances of the oracle do not lead from city {city} to city {target}')
+
+    def save(self, directory):
+        """
+        Save the oracle and its graph in .npy files of the directory
+        :param directory: a directory
+        """
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'oracle.json'), 'w') as file:
+            json.dump({'kind': self.kind, 'names': self.graph.names}, file)
+        for name in ('coordinates', 'indptr', 'indices', 'weights'):
+            np.save(os.path.join(directory, name + '.npy'), getattr(self.graph, name))
+        for name, array in self.arrays().items():
+            np.save(os.path.join(directory, name + '.npy'), array)
+
+
+class MatrixOracle(DistanceOracle):
+    """
+    Oracle storing the distances between all the pairs of cities, computed with the Floyd-Warshall algorithm
+    """
+
+    kind = 'matrix'
+
+    def __init__(self, graph, matrix):
+        super().__init__(graph)
+        self.matrix = matrix
+
+    def distance(self, source, target):
+        return float(self.matrix[source, target])
+
+    def arrays(self):
+        return {'matrix': self.matrix}
+
+
+class HubLabelOracle(DistanceOracle):
+    """
+    Oracle storing for every city a label of hubs with their distances: the distance from s to t is the minimum of
+    d(s, h) + d(h, t) over the hubs h in both the out label of s and the in label of t. The labels are built with
+    pruned landmark labeling and stored in CSR form, the hubs of a label sorted by rank.
+    """
+
+    kind = 'labels'
+
+    def __init__(self, graph, out_indptr, out_hubs, out_distances, in_indptr, in_hubs, in_distances):
+        super().__init__(graph)
+        self.out_indptr, self.out_hubs, self.out_distances = out_indptr, out_hubs, out_distances
+        self.in_indptr, self.in_hubs, self.in_distances = in_indptr, in_hubs, in_distances
+
+    def distance(self, source, target):
+        out_label = slice(self.out_indptr[source], self.out_indptr[source + 1])
+        in_label = slice(self.in_indptr[target], self.in_indptr[target + 1])
+        _, i, j = np.intersect1d(self.out_hubs[out_label], self.in_hubs[in_label],
+                                 assume_unique=True, return_indices=True)
+        if not len(i):
+            return math.inf
+        return float((self.out_distances[out_label][i] + self.in_distances[in_label][j]).min())
+
+    def arrays(self):
+        return {'out_indptr': self.out_indptr, 'out_hubs': self.out_hubs, 'out_distances': self.out_distances,
+                'in_indptr': self.in_indptr, 'in_hubs': self.in_hubs, 'in_distances': self.in_distances}
+
+
+def build_oracle(environment, max_matrix=MAX_MATRIX):
+    """
+    Build the distance oracle of a road graph: the full distance matrix for small graphs, hub labels otherwise
+    :param environment: a Roads or CompiledRoads environment
+    :param max_matrix: largest number of cities for the distance matrix
+    :return: a DistanceOracle
+    """
+    graph = compile_roads(environment) if isinstance(environment, Roads) else environment
+    if len(graph) <= max_matrix:
+        return build_matrix_oracle(graph)
+    return build_hub_label_oracle(graph)
+
+
+def build_matrix_oracle(graph):
+    """
+    Build the distance matrix of a graph with the Floyd-Warshall algorithm, one vectorized relaxation per city
+    :param graph: a CompiledRoads environment
+    :return: a MatrixOracle
+    """
+    n = len(graph)
+    matrix = np.full((n, n), np.inf)
+    sources = np.repeat(np.arange(n), np.diff(graph.indptr))
+    np.minimum.at(matrix, (sources, graph.indices), graph.weights)
+    np.fill_diagonal(matrix, 0)
+    for k in range(n):
+        np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+    return MatrixOracle(graph, matrix)
+
+
+def build_hub_label_oracle(graph, samples=16, seed=0):
+    """
+    Build the hub labels of a graph with pruned landmark labeling: the cities are taken in order of importance and
+    a Dijkstra search from each of them (forward for the in labels, backward for the out labels) adds the city to
+    the labels of the reached cities, stopping where the labels already give the distance.
+    :param graph: a CompiledRoads environment
+    :param samples: number of shortest path trees used to rank the cities
+    :param seed: seed of the choice of the sampled roots
+    :return: a HubLabelOracle
+    """
+    n = len(graph)
+    indptr, indices, weights, reverse_indptr, reverse_indices, reverse_edges = graph.csr_lists()
+    forward = [list(zip(indices[indptr[c]:indptr[c + 1]], weights[indptr[c]:indptr[c + 1]])) for c in range(n)]
+    backward = [[(reverse_indices[i], weights[reverse_edges[i]])
+                 for i in range(reverse_indptr[c], reverse_indptr[c + 1])] for c in range(n)]
+    order = importance_order(forward, samples, random.Random(seed))
+
+    # labels as lists of (rank, distance), appended in rank order
+    out_labels = [[] for _ in range(n)]
+    in_labels = [[] for _ in range(n)]
+    hub_distance = [math.inf] * n
+    for rank, hub in enumerate(order):
+        for edges, labels, other_labels in ((forward, in_labels, out_labels), (backward, out_labels, in_labels)):
+            # distances stored in the labels of the hub, indexed by rank
+            for other_rank, distance in other_labels[hub]:
+                hub_distance[other_rank] = distance
+            distances = {hub: 0}
+            fringe = [(0, hub)]
+            while fringe:
+                distance, city = heapq.heappop(fringe)
+                if distance > distances[city]:
+                    continue
+                if any(hub_distance[r] + d <= distance for r, d in labels[city]):
+                    continue
+                labels[city].append((rank, distance))
+                for next_city, length in edges[city]:
+                    new_distance = distance + length
+                    if new_distance < distances.get(next_city, math.inf):
+                        distances[next_city] = new_distance
+                        heapq.heappush(fringe, (new_distance, next_city))
+            for other_rank, _ in other_labels[hub]:
+                hub_distance[other_rank] = math.inf
+
+    return HubLabelOracle(graph, *to_csr(out_labels), *to_csr(in_labels))
+
+
+def importance_order(forward, samples, generator):
+    """
+    Rank the cities by the number of shortest paths passing through them, estimated with the subtree sizes of the
+    shortest path trees of some random roots
+    :return: the list of the cities, most important first
+    """
+    n = len(forward)
+    score = [0] * n
+    for root in generator.sample(range(n), min(samples, n)):
+        distances = {root: 0}
+        parents = {root: None}
+        settled = []
+        fringe = [(0, root)]
+        while fringe:
+            distance, city = heapq.heappop(fringe)
+            if distance > distances[city]:
+                continue
+            settled.append(city)
+            for next_city, length in forward[city]:
+                if distance + length < distances.get(next_city, math.inf):
+                    distances[next_city] = distance + length
+                    parents[next_city] = city
+                    heapq.heappush(fringe, (distance + length, next_city))
+        size = dict.fromkeys(settled, 1)
+        for city in reversed(settled):
+            if parents[city] is not None:
+                size[parents[city]] += size[city]
+            score[city] += size[city]
+    return sorted(range(n), key=lambda city: (-score[city], -len(forward[city])))
+
+
+def to_csr(labels):
+    """
+    Convert a list of labels in the CSR arrays of the hubs and of the distances
+    """
+    indptr = np.concatenate([[0], np.cumsum([len(label) for label in labels])]).astype(np.int64)
+    hubs = np.array([rank for label in labels for rank, _ in label], dtype=np.int32)
+    distances = np.array([distance for label in labels for _, distance in label], dtype=np.float64)
+    return indptr, hubs, distances
+
+
+def load_oracle(directory):
+    """
+    Load an oracle saved in a directory. The arrays are memory-mapped: they are read lazily and their pages are
+    shared among the processes using the same files.
+    :param directory: a directory
+    :return: a DistanceOracle
+    """
+    with open(os.path.join(directory, 'oracle.json')) as file:
+        manifest = json.load(file)
+
+    def load(name):
+        return np.load(os.path.join(directory, name + '.npy'), mmap_mode='r')
+
+    graph = CompiledRoads(manifest['names'], load('coordinates'), load('indptr'), load('indices'), load('weights'))
+    if manifest['kind'] == MatrixOracle.kind:
+        return MatrixOracle(graph, load('matrix'))
+    if manifest['kind'] == HubLabelOracle.kind:
+        return HubLabelOracle(graph, load('out_indptr'), load('out_hubs'), load('out_distances'),
+                              load('in_indptr'), load('in_hubs'), load('in_distances'))
+    raise ValueError(f'Unknown oracle {manifest["kind"]}')
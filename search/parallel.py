@@ -0,0 +1,319 @@
+import heapq
+import itertools
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import time
+import zlib
+
+from profiling.profiler import profiled
+from search.node import Node, follow_actions
+
+
+def owner(state, workers):
+    """
+    Given a state returns the index of the worker owning it. The hash of the pickled state is the same in every
+    process, unlike hash() of strings.
+    :param state: a state
+    :param workers: number of workers
+    :return: the index of a worker
+    """
+    return zlib.crc32(pickle.dumps(state)) % workers
+
+
+def run_worker(index, problem, strategy, inboxes, shared, batch_size):
+    """
+    Run a worker of the parallel search in its process
+    """
+    HashDistributedWorker(index, problem, strategy, inboxes, shared, batch_size).run()
+
+
+class HashDistributedWorker:
+    """
+    A worker of HashDistributedSearch: it owns the states hashed to it, with their fringe and their best cost, and
+    expands them. The nodes of the states owned by the other workers are sent to them in batches.
+    """
+
+    def __init__(self, index, problem, strategy, inboxes, shared, batch_size):
+        self.index = index
+        self.problem = problem
+        self.strategy = strategy
+        self.inboxes = inboxes
+        self.workers = len(inboxes)
+        self.incumbent, self.winner, self.sent, self.received, self.activity, self.idle, self.results = shared
+        self.batch_size = batch_size
+        # fringe of (priority, counter, cost, depth, state), best cost and (previous state, action) of every state
+        self.fringe = []
+        self.counter = itertools.count()
+        self.best_g = {}
+        self.parents = {}
+        self.visited = set()
+        # cheapest goal found by the worker and nodes waiting to be sent to every worker
+        self.goal = None
+        self.outgoing = [[] for _ in range(self.workers)]
+        self.expanded = 0
+        self.generated = 0
+
+    @profiled
+    def run(self):
+        while True:
+            # the nodes received are added before expanding, as soon as possible
+            try:
+                message = self.inboxes[self.index].get(block=not self.has_work(), timeout=0.01)
+            except queue.Empty:
+                message = None
+            if message is not None:
+                if not self.handle(message):
+                    return
+                continue
+
+            if self.has_work():
+                for _ in range(self.batch_size):
+                    if not self.has_work():
+                        break
+                    self.expand()
+                self.flush()
+            else:
+                self.idle[self.index] = 1
+
+    def handle(self, message):
+        """
+        Handle a message of the inbox
+        :param message: a tuple whose first element is the kind of message
+        :return: False if the worker has to stop, True otherwise
+        """
+        kind = message[0]
+        if kind == 'nodes':
+            # the worker is active again before the message is counted as received
+            self.idle[self.index] = 0
+            self.activity[self.index] += 1
+            for node in message[1]:
+                self.insert(*node)
+            self.received[self.index] += 1
+        elif kind == 'goal':
+            self.results.put(('goal', self.goal))
+        elif kind == 'trace':
+            state = message[1]
+            self.results.put(('trace', state, self.parents[state]))
+        elif kind == 'stop':
+            self.results.put(('stats', self.index, self.expanded, self.generated))
+            return False
+        return True
+
+    def insert(self, state, cost, depth, parent, action):
+        """
+        Add a node of an owned state to the fringe if it is the cheapest one found for the state
+        """
+        if cost >= self.best_g.get(state, math.inf):
+            return
+        priority = self.strategy.priority(Node(state=state, parent=None, action=action, cost=cost, depth=depth))
+        if priority >= self.incumbent.value:
+            return
+        self.best_g[state] = cost
+        self.parents[state] = (parent, action)
+        self.visited.discard(state)
+        heapq.heappush(self.fringe, (priority, next(self.counter), cost, depth, state))
+
+    def has_work(self):
+        """
+        Drop the entries of the fringe superseded by cheaper nodes, checks if a node can still improve the incumbent
+        :return: True if there is a node to expand
+        """
+        while self.fringe:
+            priority, _, cost, _, state = self.fringe[0]
+            if priority >= self.incumbent.value:
+                # the incumbent only decreases: no node of the fringe can improve it
+                self.fringe.clear()
+                return False
+            if cost > self.best_g[state] or state in self.visited:
+                heapq.heappop(self.fringe)
+                continue
+            return True
+        return False
+
+    def expand(self):
+        """
+        Expand the best node of the fringe, or record it if it is a goal
+        """
+        _, _, cost, depth, state = heapq.heappop(self.fringe)
+        self.visited.add(state)
+        if self.problem.goal_test(state):
+            with self.incumbent.get_lock():
+                if cost < self.incumbent.value:
+                    self.incumbent.value = cost
+                    self.winner.value = self.index
+                    self.goal = state
+            return
+
+        self.expanded += 1
+        for next_state, action in self.problem.successors(state):
+            self.generated += 1
+            node = (next_state, cost + self.problem.cost(state, action), depth + 1, state, action)
+            destination = owner(next_state, self.workers)
+            if destination == self.index:
+                self.insert(*node)
+            else:
+                self.outgoing[destination].append(node)
+                if len(self.outgoing[destination]) >= self.batch_size:
+                    self.send(destination)
+
+    def send(self, destination):
+        # the message is counted as sent before it is in the queue
+        self.sent[self.index] += 1
+        self.inboxes[destination].put(('nodes', self.outgoing[destination]))
+        self.outgoing[destination] = []
+
+    def flush(self):
+        for destination in range(self.workers):
+            if self.outgoing[destination]:
+                self.send(destination)
+
+
+class HashDistributedSearch:
+    """
+    Parallel graph search in the style of HDA* (hash distributed A*): every state is owned by the worker process
+    given by a hash of the state, and each worker expands the nodes of its states in the order of the priority of
+    the strategy (GraphUniformCost, AStar), sending the generated nodes to their owners in batches.
+    The best goal found is the incumbent: the nodes whose priority is not lower than its cost are dropped, so the
+    priority must be a lower bound of the cost of the solutions through the node (an admissible heuristic) for the
+    result to be optimal. The search ends when all the workers are idle and all the sent nodes have been received,
+    checked twice with no activity in between. The path is then traced back asking each state to its owner.
+    A worker process dying (e.g. killed for lack of memory) stops the others and raises a RuntimeError.
+    """
+
+    def __init__(self, problem, strategy, workers=None, batch_size=64):
+        """
+        :param problem: the problem
+        :param strategy: a strategy with a priority(node) method
+        :param workers: number of worker processes, the number of CPUs if None
+        :param batch_size: number of nodes sent in a message and of expansions between two checks of the inbox
+        """
+        if not hasattr(strategy, 'priority'):
+            raise ValueError('The strategy must define priority(node)')
+        self.problem = problem
+        self.strategy = strategy
+        self.workers = workers or os.cpu_count()
+        self.batch_size = batch_size
+        # expanded and generated nodes of every worker
+        self.expanded = []
+        self.generated = []
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        workers = self.workers
+        inboxes = [multiprocessing.Queue() for _ in range(workers)]
+        results = multiprocessing.Queue()
+        incumbent = multiprocessing.Value('d', math.inf)
+        winner = multiprocessing.Value('i', -1, lock=False)
+        # messages sent (the last entry is the coordinator) and received, activity epochs and idle flags
+        sent = multiprocessing.Array('q', workers + 1, lock=False)
+        received = multiprocessing.Array('q', workers, lock=False)
+        activity = multiprocessing.Array('q', workers, lock=False)
+        idle = multiprocessing.Array('b', workers, lock=False)
+        shared = (incumbent, winner, sent, received, activity, idle, results)
+        processes = [multiprocessing.Process(target=run_worker,
+                                             args=(index, self.problem, self.strategy, inboxes, shared,
+                                                   self.batch_size),
+                                             daemon=True)
+                     for index in range(workers)]
+        for process in processes:
+            process.start()
+
+        try:
+            initial_state = self.problem.initial_state
+            sent[workers] += 1
+            inboxes[owner(initial_state, workers)].put(('nodes', [(initial_state, 0, 0, None, None)]))
+            self.wait(processes, sent, received, activity, idle)
+
+            if winner.value < 0:
+                return 'Fail', []
+            inboxes[winner.value].put(('goal',))
+            goal_state = self.reply(results, 'goal', processes)[1]
+            return 'Ok', self.trace(goal_state, inboxes, results, processes)
+        finally:
+            self.stop(inboxes, results, processes)
+
+    def stop(self, inboxes, results, processes):
+        """
+        Stop the workers collecting their counters. If a worker died the others are terminated and the counters
+        are left to zero.
+        """
+        self.expanded = [0] * self.workers
+        self.generated = [0] * self.workers
+        try:
+            if all(process.is_alive() for process in processes):
+                for inbox in inboxes:
+                    inbox.put(('stop',))
+                for _ in processes:
+                    _, index, expanded, generated = self.reply(results, 'stats', processes, stopping=True)
+                    self.expanded[index] = expanded
+                    self.generated[index] = generated
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+    def check(self, processes, stopping=False):
+        """
+        Raise an error if a worker process died
+        :param processes: the worker processes
+        :param stopping: True if the workers have been asked to stop, so they can end normally
+        """
+        for index, process in enumerate(processes):
+            if process.exitcode is not None and (process.exitcode != 0 or not stopping):
+                raise RuntimeError(f'Worker {index} of the parallel search exited with code {process.exitcode}')
+
+    def wait(self, processes, sent, received, activity, idle, interval=0.005):
+        """
+        Wait for the end of the search: all the workers idle, no message in transit, and the same counters in two
+        snapshots taken one after the other. A worker dying would leave the search unfinished forever: an error
+        is raised instead.
+        """
+        previous = None
+        while True:
+            time.sleep(interval)
+            self.check(processes)
+            snapshot = (tuple(sent), tuple(received), tuple(activity), tuple(idle))
+            finished = all(snapshot[3]) and sum(snapshot[0]) == sum(snapshot[1])
+            if finished and snapshot == previous:
+                return
+            previous = snapshot if finished else None
+
+    def reply(self, results, kind, processes, stopping=False, interval=0.1):
+        """
+        Wait for the next message of a kind from the workers, raising an error if a worker dies meanwhile
+        """
+        while True:
+            try:
+                message = results.get(timeout=interval)
+            except queue.Empty:
+                self.check(processes, stopping)
+                continue
+            if message[0] == kind:
+                return message
+
+    def trace(self, goal_state, inboxes, results, processes):
+        """
+        Build the solution node asking the owner of each state of the path for its previous state
+        :param goal_state: the goal state
+        :param inboxes: the inboxes of the workers
+        :param results: the queue of the replies
+        :param processes: the worker processes
+        :return: the goal node
+        """
+        actions = []
+        state = goal_state
+        while True:
+            inboxes[owner(state, self.workers)].put(('trace', state))
+            state, action = self.reply(results, 'trace', processes)[2]
+            if state is None:
+                break
+            actions.append(action)
+
+        return follow_actions(self.problem, reversed(actions))
@@ -0,0 +1,222 @@
+import json
+import os
+
+import numpy as np
+
+# value of the table entries that are not reachable placements (e.g. two tiles on the same cell)
+UNREACHED = 255
+
+# default partitions of the tiles into disjoint patterns
+PARTITIONS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)],
+}
+
+
+class PatternDatabase:
+    """
+    Pattern database of the sliding tiles puzzle: for every placement of the tiles of a pattern, the minimum
+    number of moves of those tiles needed to bring them to their goal cells. Only the moves of the pattern tiles
+    are counted, so the values of disjoint patterns can be added (additive pattern databases).
+    The table is a uint8 array with an entry for each tuple of cells of the pattern tiles.
+    """
+
+    def __init__(self, size, pattern, table):
+        self.size = size
+        self.pattern = tuple(pattern)
+        self.table = table
+        cells = size * size
+        self.strides = [cells ** i for i in range(len(self.pattern))]
+
+    def index(self, positions):
+        """
+        Given the cells of the pattern tiles returns the entry of the table
+        :param positions: the cells of the tiles, in the order of the pattern
+        :return: an index of the table
+        """
+        return sum(p * s for p, s in zip(positions, self.strides))
+
+    def h(self, state):
+        """
+        Given a state return the value of the pattern database
+        :param state: a state
+        :return: the heuristic value
+        """
+        where = [0] * len(state)
+        for position, tile in enumerate(state):
+            where[tile] = position
+        return int(self.table[self.index([where[tile] for tile in self.pattern])])
+
+    def file_name(self):
+        return f'pdb_{self.size}x{self.size}_' + '-'.join(str(tile) for tile in self.pattern) + '.npy'
+
+    def save(self, directory):
+        """
+        Save the table in a .npy file of the directory
+        :param directory: a directory
+        :return: the path of the file
+        """
+        path = os.path.join(directory, self.file_name())
+        np.save(path, self.table)
+        return path
+
+
+class AdditivePatternDatabase:
+    """
+    The sum of pattern databases of disjoint patterns: an admissible heuristic for the sliding tiles puzzle
+    """
+
+    def __init__(self, databases):
+        self.databases = databases
+
+    def h(self, state):
+        """
+        Given a state return the sum of the pattern databases
+        :param state: a state
+        :return: the heuristic value
+        """
+        where = [0] * len(state)
+        for position, tile in enumerate(state):
+            where[tile] = position
+        return sum(int(pdb.table[pdb.index([where[tile] for tile in pdb.pattern])]) for pdb in self.databases)
+
+    def save(self, directory):
+        """
+        Save the tables in .npy files of the directory, and the partition in a manifest: the tables of other
+        partitions of the same board size can stay in the directory, only the ones of the manifest are loaded
+        :param directory: a directory
+        """
+        os.makedirs(directory, exist_ok=True)
+        for pdb in self.databases:
+            pdb.save(directory)
+        size = self.databases[0].size
+        with open(os.path.join(directory, manifest_name(size)), 'w') as file:
+            json.dump({'size': size, 'partition': [list(pdb.pattern) for pdb in self.databases]}, file)
+
+
+def manifest_name(size):
+    return f'pdb_{size}x{size}.json'
+
+
+def neighbours(size):
+    """
+    Given the size of the board returns, for each cell, the cells reached moving up, down, right and left
+    :param size: the size of the board
+    :return: an array with shape (cells, 4), -1 for the moves outside the board
+    """
+    table = np.full((size * size, 4), -1, dtype=np.int64)
+    for cell in range(size * size):
+        row, col = divmod(cell, size)
+        for move, (d_row, d_col) in enumerate([(-1, 0), (1, 0), (0, 1), (0, -1)]):
+            if 0 <= row + d_row < size and 0 <= col + d_col < size:
+                table[cell, move] = (row + d_row) * size + col + d_col
+    return table
+
+
+def build_pattern_database(size, pattern):
+    """
+    Build the pattern database of a pattern with a breadth-first search backwards from the goal. The abstract
+    states are the cells of the pattern tiles and of the empty tile: moving the empty tile on a free cell costs 0,
+    swapping it with a pattern tile costs 1. The search works on whole layers of states with NumPy.
+    :param size: the size of the board
+    :param pattern: the tiles of the pattern
+    :return: a PatternDatabase
+    """
+    cells = size * size
+    k = len(pattern)
+    strides = np.array([cells ** i for i in range(k)], dtype=np.int64)
+    blank_stride = cells ** k
+    moves = neighbours(size)
+
+    # distance of every abstract state (tiles cells + empty cell), the goal has tile t on cell t - 1
+    distance = np.full(cells ** (k + 1), UNREACHED, dtype=np.uint8)
+    tiles = np.array([[tile - 1 for tile in pattern]], dtype=np.int64)
+    blank = np.array([cells - 1], dtype=np.int64)
+    distance[tiles @ strides + blank * blank_stride] = 0
+
+    depth = 0
+    while len(blank):
+        # states at the same distance: close the layer under the moves of the empty tile on free cells
+        layer_tiles, layer_blank = [tiles], [blank]
+        while len(blank):
+            new_tiles, new_blank = [], []
+            for move in range(4):
+                target = moves[blank, move]
+                free = (target >= 0) & ~(tiles == target[:, None]).any(axis=1)
+                new_tiles.append(tiles[free])
+                new_blank.append(target[free])
+            tiles, blank = unseen(distance, np.concatenate(new_tiles), np.concatenate(new_blank),
+                                  strides, blank_stride, depth)
+            layer_tiles.append(tiles)
+            layer_blank.append(blank)
+        tiles, blank = np.concatenate(layer_tiles), np.concatenate(layer_blank)
+
+        # next layer: the empty tile swaps with a pattern tile
+        new_tiles, new_blank = [], []
+        for move in range(4):
+            target = moves[blank, move]
+            occupied = (tiles == target[:, None]) & (target >= 0)[:, None]
+            rows, tile = np.nonzero(occupied)
+            swapped = tiles[rows].copy()
+            swapped[np.arange(len(rows)), tile] = blank[rows]
+            new_tiles.append(swapped)
+            new_blank.append(target[rows])
+        depth += 1
+        tiles, blank = unseen(distance, np.concatenate(new_tiles), np.concatenate(new_blank),
+                              strides, blank_stride, depth)
+
+    # the value of a placement of the tiles is the minimum over the cells of the empty tile
+    table = distance.reshape(cells, cells ** k).min(axis=0)
+    return PatternDatabase(size, pattern, table)
+
+
+def unseen(distance, tiles, blank, strides, blank_stride, depth):
+    """
+    Keep the abstract states never reached before and set their distance
+    :return: the cells of the tiles and of the empty tile of the new states
+    """
+    indices = tiles @ strides + blank * blank_stride
+    indices, first = np.unique(indices, return_index=True)
+    new = distance[indices] == UNREACHED
+    distance[indices[new]] = depth
+    return tiles[first[new]], blank[first[new]]
+
+
+def build_additive_pattern_database(size, partition=None):
+    """
+    Build the pattern databases of a partition of the tiles
+    :param size: the size of the board
+    :param partition: a list of disjoint patterns, the default one for the size if None
+    :return: an AdditivePatternDatabase
+    """
+    if partition is None:
+        partition = PARTITIONS[size]
+    return AdditivePatternDatabase([build_pattern_database(size, pattern) for pattern in partition])
+
+
+def load_additive_pattern_database(directory, size, partition=None):
+    """
+    Load the pattern databases of a partition of the tiles saved in a directory. The tables are memory-mapped:
+    they are read lazily and their pages are shared among the processes using the same files.
+    :param directory: a directory
+    :param size: the size of the board
+    :param partition: a list of disjoint patterns, the last one saved for the size if None
+    :return: an AdditivePatternDatabase
+    """
+    if partition is None:
+        path = os.path.join(directory, manifest_name(size))
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'No pattern database for size {size} in {directory}')
+        with open(path) as file:
+            partition = json.load(file)['partition']
+    tiles = [tile for pattern in partition for tile in pattern]
+    if len(tiles) != len(set(tiles)):
+        # the moves of a tile would be counted twice: the sum would not be admissible
+        raise ValueError(f'The patterns of the partition {partition} are not disjoint')
+
+    databases = []
+    for pattern in partition:
+        pdb = PatternDatabase(size, pattern, None)
+        pdb.table = np.load(os.path.join(directory, pdb.file_name()), mmap_mode='r')
+        databases.append(pdb)
+    return AdditivePatternDatabase(databases)
@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+
+
+def rank(permutation):
+    """
+    Myrvold-Ruskey ranking: maps a permutation of 0..n-1 to an integer in 0..n!-1 in linear time. The ranks are
+    dense but not in lexicographic order.
+    :param permutation: a sequence with the numbers from 0 to n-1
+    :return: the rank of the permutation
+    """
+    permutation = list(permutation)
+    inverse = [0] * len(permutation)
+    for position, value in enumerate(permutation):
+        inverse[value] = position
+    index, factor = 0, 1
+    for n in range(len(permutation), 1, -1):
+        # move n-1 to the last position, recording the value it replaces
+        value = permutation[n - 1]
+        position = inverse[n - 1]
+        permutation[n - 1], permutation[position] = n - 1, value
+        inverse[value], inverse[n - 1] = position, n - 1
+        index += value * factor
+        factor *= n
+    return index
+
+
+def unrank(index, size):
+    """
+    Inverse of rank: the permutation of 0..size-1 with the given Myrvold-Ruskey rank
+    :param index: a rank in 0..size!-1
+    :param size: number of elements
+    :return: a tuple with the permutation
+    """
+    permutation = list(range(size))
+    for n in range(size, 1, -1):
+        index, position = divmod(index, n)
+        permutation[n - 1], permutation[position] = permutation[position], permutation[n - 1]
+    return tuple(permutation)
+
+
+class PermutationSet:
+    """
+    Set of the permutations of some elements (the states of EightTilesProblem and PancakeProblem) stored as a
+    preallocated bitset with a bit for the rank of every permutation: n!/8 bytes, e.g. 45 KB for the 9! states of
+    the 8-puzzle and 60 MB for the 12! stacks of 12 pancakes, instead of more than 100 bytes per state of a set.
+    It can be given as visited set to the graph strategies.
+    """
+
+    def __init__(self, elements):
+        """
+        :param elements: the elements of the permutations, e.g. the goal state
+        """
+        self.elements = tuple(sorted(elements))
+        self.positions = {element: position for position, element in enumerate(self.elements)}
+        self.capacity = math.factorial(len(self.elements))
+        self.bits = bytearray((self.capacity + 7) // 8)
+        self.size = 0
+
+    def index(self, state):
+        return rank([self.positions[element] for element in state])
+
+    def state(self, index):
+        return tuple(self.elements[position] for position in unrank(index, len(self.elements)))
+
+    def add(self, state):
+        index = self.index(state)
+        mask = 1 << (index & 7)
+        if not self.bits[index >> 3] & mask:
+            self.bits[index >> 3] |= mask
+            self.size += 1
+
+    def discard(self, state):
+        index = self.index(state)
+        mask = 1 << (index & 7)
+        if self.bits[index >> 3] & mask:
+            self.bits[index >> 3] &= ~mask & 0xFF
+            self.size -= 1
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+        self.size = 0
+
+    def __contains__(self, state):
+        index = self.index(state)
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """
+        Iterate over the states in the set, in the order of their ranks
+        """
+        flags = np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8), bitorder='little')
+        for index in np.flatnonzero(flags):
+            yield self.state(int(index))
@@ -0,0 +1,138 @@
+import multiprocessing
+import queue
+import random
+import time
+
+from search.node import Node
+from search.tree_search import TreeSearch
+
+# seconds between two checks of the worker processes while waiting for the results
+POLL = 0.1
+
+
+def run_configuration(index, problem, strategy, seed, results):
+    """
+    Run a configuration of the portfolio in a worker process and put the outcome in the results queue
+    :param index: index of the configuration
+    :param problem: the problem
+    :param strategy: the search strategy
+    :param seed: seed of the random generator, None to leave it as it is
+    :param results: a queue
+    """
+    if seed is not None:
+        random.seed(seed)
+    start = time.perf_counter()
+    try:
+        result, node = TreeSearch(problem=problem, strategy=strategy).run()
+    except Exception as error:
+        results.put((index, 'Error: ' + repr(error), [], time.perf_counter() - start))
+        return
+    results.put((index, result, to_steps(node) if result == 'Ok' else [], time.perf_counter() - start))
+
+
+def to_steps(node):
+    """
+    Given a node returns the (state, action, cost, depth) of the nodes of its path: a flat list is sent between
+    processes instead of a deep chain of nodes
+    :param node: a node
+    :return: a list of tuples from the root to the node
+    """
+    steps = []
+    while node is not None:
+        steps.append((node.state, node.action, node.cost, node.depth))
+        node = node.parent
+    return list(reversed(steps))
+
+
+def from_steps(steps):
+    """
+    Build back the node of a path given by to_steps
+    :param steps: a list of (state, action, cost, depth)
+    :return: a node
+    """
+    node = None
+    for state, action, cost, depth in steps:
+        node = Node(state=state, parent=node, action=action, cost=cost, depth=depth)
+    return node
+
+
+class Portfolio:
+    """
+    Run several search configurations on the same problem in parallel processes. With mode 'first' the first
+    solution found wins, with mode 'best' the cheapest solution found before the timeout wins; the other processes
+    are stopped as soon as the winner is known. A worker process dying without a result (e.g. killed for lack of
+    memory) is reported as a failed configuration.
+    """
+
+    def __init__(self, problem, configurations, timeout=None, mode='first'):
+        """
+        :param problem: the problem
+        :param configurations: a list of (name, strategy) or (name, strategy, seed)
+        :param timeout: maximum time in seconds, None to wait for the configurations
+        :param mode: 'first' or 'best'
+        """
+        if mode not in ('first', 'best'):
+            raise ValueError(f'Unknown mode {mode}')
+        self.problem = problem
+        self.configurations = [tuple(configuration) + (None,) * (3 - len(configuration))
+                               for configuration in configurations]
+        self.timeout = timeout
+        self.mode = mode
+        # name of the winning configuration and (result, cost, time) of every finished configuration
+        self.winner = None
+        self.results = {}
+
+    def run(self):
+        """
+        Run the portfolio
+        :return: the path of the winning configuration or a failure
+        """
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=run_configuration,
+                                             args=(index, self.problem, strategy, seed, results),
+                                             daemon=True)
+                     for index, (name, strategy, seed) in enumerate(self.configurations)]
+        deadline = None if self.timeout is None else time.perf_counter() + self.timeout
+        for process in processes:
+            process.start()
+
+        best = None
+        start = time.perf_counter()
+        pending = set(range(len(processes)))
+        try:
+            while pending:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    break
+                # a worker that exited before the poll and sent nothing died without a result
+                exited = [index for index in pending if processes[index].exitcode is not None]
+                try:
+                    index, result, steps, elapsed = results.get(timeout=POLL if remaining is None
+                                                                else min(POLL, remaining))
+                except queue.Empty:
+                    for index in exited:
+                        name = self.configurations[index][0]
+                        self.results[name] = (f'Error: exit code {processes[index].exitcode}', None,
+                                              time.perf_counter() - start)
+                        pending.discard(index)
+                    continue
+
+                pending.discard(index)
+                name = self.configurations[index][0]
+                cost = steps[-1][2] if steps else None
+                self.results[name] = (result, cost, elapsed)
+                if result == 'Ok' and (best is None or cost < best[2]):
+                    best = (name, steps, cost)
+                    if self.mode == 'first':
+                        break
+        finally:
+            # cancel the configurations still running
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        if best is None:
+            return 'Fail', []
+        self.winner = best[0]
+        return 'Ok', from_steps(best[1])
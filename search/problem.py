@@ -3,13 +3,19 @@ import random
 
 import numpy as np
 
+from search.node import follow_actions
+
 
 class StreetProblem:
 
-    def __init__(self, initial_state, goal_state, environment):
+    def __init__(self, initial_state, goal_state, environment, oracle=None):
         self.initial_state = initial_state
         self.goal_state = goal_state
         self.environment = environment
+        # the actions can be undone with the same cost (the graph of the states is undirected)
+        self.symmetric = getattr(environment, 'symmetric', False)
+        # a DistanceOracle of the environment: exact heuristic and direct answer of the problem
+        self.oracle = oracle
 
     def successors(self, state):
         """
@@ -56,16 +62,120 @@ class StreetProblem:
         return self.environment.distance(state, reached_state)
 
     def h(self, state):
+        if self.oracle is not None:
+            ids = self.oracle.graph.ids
+            return self.oracle.distance(ids[state], ids[self.goal_state])
         goal_x, goal_y = self.environment.coordinates[self.goal_state]
         x, y = self.environment.coordinates[state]
         return math.sqrt((goal_x - x) ** 2 + (goal_y - y) ** 2)
 
+    def solve(self):
+        """
+        Answer the problem with the oracle, without searching
+        :return: a path or a failure
+        """
+        ids = self.oracle.graph.ids
+        path = self.oracle.path(ids[self.initial_state], ids[self.goal_state])
+        if path is None:
+            return 'Fail', []
+        return 'Ok', follow_actions(self, [self.oracle.graph.names[city] for city in path])
+
 
-class EightTilesProblem:
+class CompiledStreetProblem:
+    """
+    StreetProblem on CompiledRoads: the states are the ids of the cities and the actions are the indices of the
+    streets, so the reached city and the cost of an action are read from the CSR arrays.
+    """
 
-    def __init__(self, initial_state):
+    def __init__(self, initial_state, goal_state, environment):
         self.initial_state = initial_state
-        self.goal_state = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+        self.goal_state = goal_state
+        self.environment = environment
+        self.symmetric = environment.symmetric
+        (self.indptr, self.indices, self.weights,
+         self.reverse_indptr, self.reverse_indices, self.reverse_edges) = environment.csr_lists()
+        # straight-line distances from the goal, computed for all the cities at once
+        self.h_goal = None
+        self.h_values = None
+
+    def successors(self, state):
+        """
+        Given a state returns the reachable states with the respective actions
+        :param state: actual state
+        :return: list of successor states and actions
+        """
+        indices = self.indices
+        return [(indices[edge], edge) for edge in range(self.indptr[state], self.indptr[state + 1])]
+
+    def predecessors(self, state):
+        """
+        Given a state returns the states reaching it with the respective actions
+        :param state: actual state
+        :return: list of previous states and actions
+        """
+        return [(self.reverse_indices[i], self.reverse_edges[i])
+                for i in range(self.reverse_indptr[state], self.reverse_indptr[state + 1])]
+
+    def actions(self, state):
+        """
+        Given a state returns the list of possible actions
+        :param state: actual state
+        :return: a list of actions
+        """
+        return range(self.indptr[state], self.indptr[state + 1])
+
+    def result(self, state=None, action=None):
+        """
+        Given a state and an action returns the reached state
+        :param state: actual state
+        :param action: chosen action
+        :return: reached state
+        """
+        return self.indices[action]
+
+    def goal_test(self, state):
+        """
+        Checks if the goal condition has been reached
+        :param state: actual state
+        :return: True if the goal condition is matched, False otherwise
+        """
+        return state == self.goal_state
+
+    def cost(self, state, action):
+        """
+        Given a state and an action returns the cost of the action
+        :param state: a state
+        :param action: an action
+        :return: the cost of doing that action in that state
+        """
+        return self.weights[action]
+
+    def h(self, state):
+        if self.h_goal != self.goal_state:
+            self.h_values = self.environment.distances_to(self.goal_state).tolist()
+            self.h_goal = self.goal_state
+        return self.h_values[state]
+
+    def city_path(self, node):
+        """
+        Given a node returns its path as the list of the names of the reached cities
+        :param node: a node
+        :return: a list of cities
+        """
+        return [self.environment.names[self.indices[edge]] for edge in node.path()]
+
+
+class TilesProblem:
+    """
+    The sliding tiles puzzle on a size x size board. States are tuples with the tiles row by row, 0 is the empty tile.
+    The heuristic is the number of misplaced tiles, or the sum of additive pattern databases if they are given.
+    """
+
+    def __init__(self, initial_state, size, pdb=None):
+        self.initial_state = initial_state
+        self.size = size
+        self.goal_state = tuple(range(1, size * size)) + (0,)
+        self.pdb = pdb
 
     def successors(self, state):
         """
@@ -83,8 +193,8 @@ class EightTilesProblem:
         :return: a row and a column
         """
         pos = state.index(0)
-        row = pos // 3
-        col = pos % 3
+        row = pos // self.size
+        col = pos % self.size
         return row, col
 
     def actions(self, state):
@@ -97,9 +207,9 @@ class EightTilesProblem:
         row, col = self.get_empty_tile(state)
         if row > 0:
             actions.append('Up')
-        if row < 2:
+        if row < self.size - 1:
             actions.append('Down')
-        if col < 2:
+        if col < self.size - 1:
             actions.append('Right')
         if col > 0:
             actions.append('Left')
@@ -125,14 +235,71 @@ class EightTilesProblem:
         if action == 'Right':
             new_col = col + 1
 
-        new_pos = new_row * 3 + new_col
-        old_pos = row * 3 + col
+        new_pos = new_row * self.size + new_col
+        old_pos = row * self.size + col
         new_state = list(state)
         new_state[old_pos] = state[new_pos]
         new_state[new_pos] = 0
 
         return tuple(new_state)
 
+    def inverse(self, action):
+        """
+        Given an action returns the action that undoes it
+        :param action: an action
+        :return: the opposite action
+        """
+        return {'Up': 'Down', 'Down': 'Up', 'Left': 'Right', 'Right': 'Left'}[action]
+
+    def to_array(self, states):
+        """
+        Given a list of states returns them as the rows of an array
+        :param states: a list of states
+        :return: an array with shape (states, cells)
+        """
+        return np.array(states, dtype=np.uint8).reshape(-1, self.size * self.size)
+
+    def from_array(self, row):
+        """
+        Given a row of an array of states returns the state
+        :param row: a row
+        :return: a state
+        """
+        return tuple(int(tile) for tile in row)
+
+    def expand_batch(self, layer):
+        """
+        Given a layer of states returns all their successors
+        :param layer: an array of states, one per row
+        :return: the array of the successors, the row of their parent in the layer, the codes of the actions
+        and the costs
+        """
+        blank = np.argmin(layer, axis=1)
+        row, col = blank // self.size, blank % self.size
+        children, parents, actions = [], [], []
+        for code, (d_row, d_col) in enumerate([(-1, 0), (1, 0), (0, 1), (0, -1)]):
+            index = np.nonzero((row + d_row >= 0) & (row + d_row < self.size) &
+                               (col + d_col >= 0) & (col + d_col < self.size))[0]
+            source = blank[index]
+            target = source + d_row * self.size + d_col
+            child = layer[index]
+            rows = np.arange(len(index))
+            child[rows, source] = layer[index, target]
+            child[rows, target] = 0
+            children.append(child)
+            parents.append(index)
+            actions.append(np.full(len(index), code))
+        parents = np.concatenate(parents)
+        return np.concatenate(children), parents, np.concatenate(actions), np.ones(len(parents))
+
+    def batch_action(self, code):
+        """
+        Given the code of an action in expand_batch returns the action
+        :param code: an action code
+        :return: an action
+        """
+        return ('Up', 'Down', 'Right', 'Left')[code]
+
     def goal_test(self, state):
         """
         Checks if the goal condition has been reached
@@ -156,23 +323,156 @@ class EightTilesProblem:
         :param state: a state
         :return: the heuristic value
         """
+        if self.pdb is not None:
+            return self.pdb.h(state)
         h = 0
-        for index in range(8):
+        for index in range(len(self.goal_state) - 1):
             if state[index] != self.goal_state[index]:
                 h += 1
         return h
 
     @staticmethod
     def print(state):
-        print('_____________')
+        size = math.isqrt(len(state))
+        print('____' * size + '_')
         for i, n in enumerate(state):
             print('|', end='')
             if n == 0:
                 n = 'x'
             print(f' {n} ', end='')
-            if i % 3 == 2:
+            if i % size == size - 1:
                 print('|')
-        print('_____________')
+        print('____' * size + '_')
+
+
+class PackedTilesProblem:
+    """
+    The sliding tiles puzzle (up to 4 x 4) with the states packed in a single integer: 4 bits per cell, cell i in
+    the bits 4i..4i+3, and the position of the empty tile in the bits above the board. The moves of the empty
+    tile are precomputed for every cell, so a successor is computed with a shift, a mask and an addition.
+    The initial state is given as a tuple, as for TilesProblem, and decode() converts back a packed state.
+    """
+
+    def __init__(self, initial_state, size=3, pdb=None):
+        self.size = size
+        self.cells = size * size
+        self.blank_shift = 4 * self.cells
+        self.board_mask = (1 << self.blank_shift) - 1
+        # one bit for each cell but the last one, used to count the misplaced tiles
+        self.low_bits = sum(1 << (4 * i) for i in range(self.cells - 1))
+        self.pdb = pdb
+        self.goal_state = self.encode(tuple(range(1, self.cells)) + (0,))
+        self.initial_state = self.encode(initial_state) if initial_state is not None else None
+
+        # for every cell of the empty tile: (action, shift of the moved tile, factor, change of the empty cell)
+        self.moves = []
+        for blank in range(self.cells):
+            row, col = divmod(blank, size)
+            moves = []
+            for action, d_row, d_col in [('Up', -1, 0), ('Down', 1, 0), ('Right', 0, 1), ('Left', 0, -1)]:
+                if 0 <= row + d_row < size and 0 <= col + d_col < size:
+                    target = (row + d_row) * size + col + d_col
+                    # the tile moves from the target cell to the empty cell
+                    factor = (1 << (4 * blank)) - (1 << (4 * target))
+                    moves.append((action, 4 * target, factor, (target - blank) << self.blank_shift))
+            self.moves.append(moves)
+        self.moves_by_action = [{move[0]: move for move in moves} for moves in self.moves]
+
+    def encode(self, state):
+        """
+        Pack a tuple state in an integer
+        :param state: a tuple with the tiles row by row
+        :return: the packed state
+        """
+        packed = state.index(0) << self.blank_shift
+        for cell, tile in enumerate(state):
+            packed |= tile << (4 * cell)
+        return packed
+
+    def decode(self, state):
+        """
+        Unpack an integer state in a tuple
+        :param state: a packed state
+        :return: a tuple with the tiles row by row
+        """
+        return tuple((state >> (4 * cell)) & 15 for cell in range(self.cells))
+
+    def successors(self, state):
+        """
+        Given a state returns the reachable states with the respective actions
+        :param state: actual state
+        :return: list of successor states and actions
+        """
+        successors = []
+        for action, shift, factor, blank_change in self.moves[state >> self.blank_shift]:
+            successors.append((state + ((state >> shift) & 15) * factor + blank_change, action))
+        return successors
+
+    def actions(self, state):
+        """
+        Given a state returns the list of possible actions
+        :param state: actual state
+        :return: a list of actions
+        """
+        return [move[0] for move in self.moves[state >> self.blank_shift]]
+
+    def result(self, state=None, action=None):
+        """
+        Given a state and an action returns the reached state
+        :param state: actual state
+        :param action: chosen action
+        :return: reached state
+        """
+        _, shift, factor, blank_change = self.moves_by_action[state >> self.blank_shift][action]
+        return state + ((state >> shift) & 15) * factor + blank_change
+
+    def inverse(self, action):
+        """
+        Given an action returns the action that undoes it
+        :param action: an action
+        :return: the opposite action
+        """
+        return {'Up': 'Down', 'Down': 'Up', 'Left': 'Right', 'Right': 'Left'}[action]
+
+    def goal_test(self, state):
+        """
+        Checks if the goal condition has been reached
+        :param state: actual state
+        :return: True if the goal condition is matched, False otherwise
+        """
+        return state == self.goal_state
+
+    def cost(self, state, action):
+        """
+        Given a state and an action return the cost of the action
+        :param state: a state
+        :param action: a possible action
+        :return: a cost
+        """
+        return 1
+
+    def h(self, state):
+        """
+        Given a state return the value of the heuristic
+        :param state: a state
+        :return: the heuristic value
+        """
+        if self.pdb is not None:
+            return self.pdb.h(self.decode(state))
+        # number of cells (but the last one) differing from the goal: one bit for each non-zero nibble
+        diff = (state ^ self.goal_state) & self.board_mask
+        diff |= diff >> 1
+        diff |= diff >> 2
+        return bin(diff & self.low_bits).count('1')
+
+    def print(self, state):
+        TilesProblem.print(self.decode(state))
+
+
+class EightTilesProblem(TilesProblem):
+
+    def __init__(self, initial_state, pdb=None):
+        super().__init__(initial_state=initial_state, size=3, pdb=pdb)
 
 
 class EightQueensProblem:
@@ -295,7 +595,7 @@ class EightQueensProblem:
 
 class GridProblem:
     """
-    Finding a path on a 2D grid with obstacles. Obstacles are (x, y) cells.
+    Finding a path on a 2D grid with obstacles. Obstacles are (x, y) cells, the environment tells the free ones.
     States:   (x, y) cell locations.
     Actions:  (dx, dy) cell movements.
     """
@@ -304,6 +604,8 @@ class GridProblem:
         self.initial_state = initial_state
         self.goal_state = goal_state
         self.environment = environment
+        # moving between two free cells can always be undone with the same cost
+        self.symmetric = True
         self.directions = [
             (-1, -1), (0, -1), (+1, -1),
             (-1, 0),           (+1,  0),
@@ -316,12 +618,11 @@ class GridProblem:
 
     def actions(self, state):
         x, y = state
-        possible_actions = [(x+dx, y+dy) for (dx, dy) in self.directions]
-        possible_actions = set(possible_actions) - self.environment.obstacles
-        return possible_actions
+        is_free = self.environment.is_free
+        return [(x+dx, y+dy) for (dx, dy) in self.directions if is_free(x+dx, y+dy)]
 
     def result(self, state=None, action=None):
-        return action if action not in self.environment.obstacles else state
+        return action if self.environment.is_free(*action) else state
 
     def goal_test(self, state):
         return state == self.goal_state
@@ -412,6 +713,36 @@ class PancakeProblem:
         new_state = [new_state[i] for i in range(action, len(new_state))]
         return tuple(top_i + new_state)
 
+    def inverse(self, action):
+        # flipping the same pancakes twice restores the stack
+        return action
+
+    def to_array(self, states):
+        return np.array(states).reshape(-1, len(self.goal_state))
+
+    def from_array(self, row):
+        return tuple(int(pancake) for pancake in row)
+
+    def expand_batch(self, layer):
+        """
+        Given a layer of states returns all their successors
+        :param layer: an array of states, one per row
+        :return: the array of the successors, the row of their parent in the layer, the codes of the actions
+        and the costs
+        """
+        states, pancakes = layer.shape
+        children = []
+        for action in range(2, pancakes + 1):
+            child = layer.copy()
+            child[:, :action] = layer[:, action - 1::-1]
+            children.append(child)
+        parents = np.tile(np.arange(states), pancakes - 1)
+        actions = np.repeat(np.arange(2, pancakes + 1), states)
+        return np.concatenate(children), parents, actions, np.ones(len(parents))
+
+    def batch_action(self, code):
+        return int(code)
+
     def goal_test(self, state):
         return state == self.goal_state
 
@@ -457,6 +788,45 @@ class JumpingFrogsProblem:
         result[i], result[j] = state[j], state[i]
         return ''.join(result)
 
+    def to_array(self, states):
+        # L, . and R are stored as 0, 1 and 2
+        return np.array([['L.R'.index(c) for c in state] for state in states], dtype=np.uint8)
+
+    def from_array(self, row):
+        return ''.join('L.R'[c] for c in row)
+
+    def expand_batch(self, layer):
+        """
+        Given a layer of states returns all their successors
+        :param layer: an array of states, one per row
+        :return: the array of the successors, the row of their parent in the layer, the codes of the actions
+        (i * length + j for the action (i, j)) and the costs
+        """
+        length = layer.shape[1]
+        blank = np.argmax(layer == 1, axis=1)
+        children, parents, actions = [], [], []
+        # position of the frog with respect to the empty stone, frog, frog to jump over (None for a slide)
+        for offset, frog, other in [(-1, 0, None), (-2, 0, 2), (1, 2, None), (2, 2, 0)]:
+            source = blank + offset
+            valid = (source >= 0) & (source < length)
+            valid[valid] = layer[valid, source[valid]] == frog
+            if other is not None:
+                middle = blank + offset // 2
+                valid[valid] = layer[valid, middle[valid]] == other
+            index = np.nonzero(valid)[0]
+            child = layer[index]
+            rows = np.arange(len(index))
+            child[rows, blank[index]] = frog
+            child[rows, source[index]] = 1
+            children.append(child)
+            parents.append(index)
+            actions.append(source[index] * length + blank[index])
+        parents = np.concatenate(parents)
+        return np.concatenate(children), parents, np.concatenate(actions), np.ones(len(parents))
+
+    def batch_action(self, code):
+        return divmod(int(code), len(self.initial_state))
+
     def goal_test(self, state):
         return state == self.goal_state
 
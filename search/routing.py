@@ -0,0 +1,116 @@
+import heapq
+import math
+from collections import OrderedDict
+
+
+class RouteQueries:
+    """
+    Shortest path queries between many origins and destinations of the same Roads (or CompiledRoads) environment.
+    The queries are grouped by origin (one shortest path tree from every origin) or by destination (one tree
+    towards every destination, on the reversed streets), whichever needs fewer trees. The trees are kept and reused
+    by the next queries, so the work depends on the number of distinct endpoints and not on the number of queries.
+    """
+
+    def __init__(self, environment, max_trees=None):
+        self.environment = environment
+        # maximum number of trees kept in memory, None for no limit
+        self.max_trees = max_trees
+        self.trees = OrderedDict()
+        # number of trees computed
+        self.built = 0
+
+        # adjacency lists with the length of the streets: city -> list of (city, distance)
+        self.forward = environment.edges()
+        self.backward = {city: [] for city in self.forward}
+        for city, edges in self.forward.items():
+            for next_city, distance in edges:
+                self.backward.setdefault(next_city, []).append((city, distance))
+
+    def tree(self, root, reverse=False):
+        """
+        Shortest path tree of a city, computed with Dijkstra algorithm or taken from the computed ones
+        :param root: a city
+        :param reverse: False for the paths from the city, True for the paths towards the city
+        :return: the dictionaries of the distances and of the parents (next city towards the root)
+        """
+        key = (root, reverse)
+        if key in self.trees:
+            self.trees.move_to_end(key)
+            return self.trees[key]
+
+        edges = self.backward if reverse else self.forward
+        distances = {root: 0}
+        parents = {root: None}
+        visited = set()
+        fringe = [(0, root)]
+        while fringe:
+            distance, city = heapq.heappop(fringe)
+            if city in visited:
+                continue
+            visited.add(city)
+            for next_city, length in edges.get(city, []):
+                new_distance = distance + length
+                if new_distance < distances.get(next_city, math.inf):
+                    distances[next_city] = new_distance
+                    parents[next_city] = city
+                    heapq.heappush(fringe, (new_distance, next_city))
+
+        self.built += 1
+        self.trees[key] = (distances, parents)
+        if self.max_trees is not None and len(self.trees) > self.max_trees:
+            self.trees.popitem(last=False)
+        return distances, parents
+
+    def query(self, origin, destination, reverse=False):
+        """
+        Shortest path between two cities
+        :param origin: the initial city
+        :param destination: the goal city
+        :param reverse: use the tree towards the destination instead of the tree from the origin
+        :return: the path (list of the reached cities, as the actions of StreetProblem) and its cost,
+        None and infinity if the destination cannot be reached
+        """
+        if reverse:
+            distances, parents = self.tree(destination, reverse=True)
+            if origin not in distances:
+                return None, math.inf
+            path = []
+            city = origin
+            while parents[city] is not None:
+                city = parents[city]
+                path.append(city)
+            return path, distances[origin]
+
+        distances, parents = self.tree(origin)
+        if destination not in distances:
+            return None, math.inf
+        path = []
+        city = destination
+        while parents[city] is not None:
+            path.append(city)
+            city = parents[city]
+        return list(reversed(path)), distances[destination]
+
+    def batch(self, queries):
+        """
+        Answer a list of queries, grouped by the root of their tree so that every tree is computed at most once
+        even when max_trees is lower than the number of roots
+        :param queries: a list of (origin, destination)
+        :return: a list of (path, cost), in the order of the queries
+        """
+        origins = {origin for origin, _ in queries}
+        destinations = {destination for _, destination in queries}
+        # trees still to be computed for each grouping
+        missing_origins = len([o for o in origins if (o, False) not in self.trees])
+        missing_destinations = len([d for d in destinations if (d, True) not in self.trees])
+        reverse = missing_destinations < missing_origins
+
+        groups = {}
+        for index, (origin, destination) in enumerate(queries):
+            groups.setdefault(destination if reverse else origin, []).append(index)
+        answers = [None] * len(queries)
+        for indices in groups.values():
+            for index in indices:
+                origin, destination = queries[index]
+                answers[index] = self.query(origin, destination, reverse=reverse)
+        return answers
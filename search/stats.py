@@ -0,0 +1,81 @@
+import time
+
+
+class SearchStats:
+    """
+    Counters and timings of a search run. The search updates them only when a SearchStats object is given,
+    so a search without statistics runs at full speed. Timing every call of successors, cost and h has a
+    noticeable overhead: with timing=False only the counters and the total time are collected.
+    """
+
+    def __init__(self, timing=True, every=None, callback=None):
+        if (every is None) != (callback is None) or (every is not None and every < 1):
+            raise ValueError('every (a positive number of expansions) and callback must be given together')
+        self.timing = timing
+        # callback(stats) called every N expansions
+        self.every = every
+        self.callback = callback
+        self.expanded = 0
+        self.generated = 0
+        self.pruned = 0
+        self.fringe_peak = 0
+        self.depth = 0
+        self.time = {'successors': 0.0, 'cost': 0.0, 'h': 0.0, 'fringe': 0.0, 'total': 0.0}
+
+    def __repr__(self):
+        return (f'expanded: {self.expanded}, generated: {self.generated}, pruned: {self.pruned}, '
+                f'fringe peak: {self.fringe_peak}, branching factor: {self.branching_factor():.3f}, '
+                f'time: ' + ', '.join(f'{phase} {seconds:.4f}s' for phase, seconds in self.time.items()))
+
+    def timed(self, phase, function):
+        """
+        Wrap a function so that its running time is added to a phase
+        :param phase: the name of the phase
+        :param function: a function
+        :return: the wrapped function
+        """
+        times = self.time
+        clock = time.perf_counter
+
+        def timed_function(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                times[phase] += clock() - start
+        return timed_function
+
+    def step(self, generated, fringe_size):
+        """
+        Update the counters after the expansion of a node
+        :param generated: the number of generated nodes
+        :param fringe_size: the size of the fringe after the expansion
+        """
+        self.expanded += 1
+        self.generated += generated
+        if fringe_size > self.fringe_peak:
+            self.fringe_peak = fringe_size
+        if self.every and self.expanded % self.every == 0:
+            self.callback(self)
+
+    def branching_factor(self):
+        """
+        Effective branching factor: the branching factor b* of a uniform tree of the solution depth d
+        containing the generated nodes (N = b* + b*^2 + ... + b*^d)
+        :return: the effective branching factor
+        """
+        if self.depth == 0 or self.generated == 0:
+            return 0.0
+
+        def nodes(b):
+            return sum(b ** i for i in range(1, self.depth + 1))
+
+        # bisection on b*, which is at most N^(1/d) when it is greater than one
+        low, high = 0.0, max(1.0, self.generated ** (1 / self.depth))
+        for _ in range(100):
+            middle = (low + high) / 2
+            if nodes(middle) < self.generated:
+                low = middle
+            else:
+                high = middle
+        return (low + high) / 2
@@ -1,45 +1,66 @@
 import random
 
+from search.fringe import DequeFringe, PriorityFringe
+
 
 class BreadthFirst:
+    def __init__(self, early_goal_test=False):
+        # run the goal test when the nodes are generated instead of when they are expanded
+        self.early_goal_test = early_goal_test
+
+    def new_fringe(self):
+        return DequeFringe()
+
     def add_visited(self, state):
         pass
 
     def select(self, fringe, new_nodes):
-        return new_nodes + fringe
+        fringe.extend(new_nodes)
+        return fringe
 
 
 class DepthFirst:
+    def new_fringe(self):
+        return DequeFringe(lifo=True)
+
     def add_visited(self, state):
         pass
 
     def select(self, fringe, new_nodes):
-        return fringe + new_nodes
+        fringe.extend(new_nodes)
+        return fringe
 
 
 class GraphBreadthFirst:
-    def __init__(self):
-        self.visited = set()
+    def __init__(self, early_goal_test=False, visited=None):
+        # visited states, a set or any container with add, discard and in (e.g. a PermutationSet)
+        self.visited = set() if visited is None else visited
+        # run the goal test when the nodes are generated instead of when they are expanded
+        self.early_goal_test = early_goal_test
+
+    def new_fringe(self):
+        return DequeFringe(visited=self.visited)
 
     def add_visited(self, state):
         self.visited.add(state)
 
     def select(self, fringe, new_nodes):
-        fringe = new_nodes + fringe
-        fringe = [n for n in fringe if n.state not in self.visited]
+        fringe.extend(new_nodes)
         return fringe
 
 
 class GraphDepthFirst:
-    def __init__(self):
-        self.visited = set()
+    def __init__(self, visited=None):
+        self.visited = set() if visited is None else visited
+
+    def new_fringe(self):
+        return DequeFringe(lifo=True, visited=self.visited)
 
     def add_visited(self, state):
         self.visited.add(state)
 
     def select(self, fringe, new_nodes):
-        fringe = fringe + new_nodes
-        fringe = [n for n in fringe if n.state not in self.visited]
+        fringe.extend(new_nodes)
         return fringe
 
 
@@ -47,34 +68,37 @@ class DepthLimited:
     def __init__(self, limit):
         self.limit = limit
 
+    def new_fringe(self):
+        return DequeFringe(lifo=True, limit=self.limit)
+
     def add_visited(self, state):
         pass
 
     def select(self, fringe, new_nodes):
-        fringe = fringe + new_nodes
-        fringe = [n for n in fringe if n.depth <= self.limit]
+        fringe.extend(new_nodes)
         return fringe
 
 
 class GraphDepthLimited:
-    def __init__(self, limit):
+    def __init__(self, limit, visited=None):
         self.limit = limit
-        self.visited = set()
+        self.visited = set() if visited is None else visited
+
+    def new_fringe(self):
+        return DequeFringe(lifo=True, visited=self.visited, limit=self.limit)
 
     def add_visited(self, state):
         self.visited.add(state)
 
     def select(self, fringe, new_nodes):
-        fringe = fringe + new_nodes
-        fringe = [n for n in fringe
-                  if n.state not in self.visited and n.depth <= self.limit]
+        fringe.extend(new_nodes)
         return fringe
 
 
 class GraphRandom:
 
-    def __init__(self):
-        self.visited = set()
+    def __init__(self, visited=None):
+        self.visited = set() if visited is None else visited
 
     def add_visited(self, state):
         self.visited.add(state)
@@ -88,47 +112,79 @@ class GraphRandom:
 
 
 class GraphUniformCost:
-    def __init__(self):
-        self.visited = set()
+    def __init__(self, best_g=False, visited=None):
+        self.visited = set() if visited is None else visited
+        # keep only the cheapest node of each state in the fringe
+        self.best_g = best_g
+
+    def new_fringe(self):
+        # fringe ordered following the cost g(n)
+        return PriorityFringe(key=self.priority,
+                              visited=self.visited,
+                              best_g={} if self.best_g else None)
 
     def add_visited(self, state):
         self.visited.add(state)
 
+    def priority(self, node):
+        return node.cost
+
     def select(self, fringe, new_nodes):
-        fringe = fringe + new_nodes
-        fringe = [n for n in fringe if n.state not in self.visited]
-        # sort fringe following the cost g(n)
-        fringe = sorted(fringe, key=lambda x: -x.cost)
+        fringe.extend(new_nodes)
         return fringe
 
 
 class Greedy:
-    def __init__(self, problem):
-        self.visited = set()
+    def __init__(self, problem, visited=None):
+        self.visited = set() if visited is None else visited
         self.problem = problem
+        # the heuristic function, h is a timed wrapper of it when the search collects the timings
+        self.heuristic = problem.h
+        self.h = self.heuristic
+
+    def new_fringe(self):
+        # fringe ordered following the heuristic function h(n)
+        return PriorityFringe(key=self.priority, visited=self.visited)
 
     def add_visited(self, state):
         self.visited.add(state)
 
+    def priority(self, node):
+        return self.h(node.state)
+
     def select(self, fringe, new_nodes):
-        fringe = fringe + new_nodes
-        fringe = [n for n in fringe if n.state not in self.visited]
-        # sort fringe following the heuristic function h(n)
-        fringe = sorted(fringe, key=lambda x: -self.problem.h(x.state))
+        fringe.extend(new_nodes)
         return fringe
 
 
 class AStar:
-    def __init__(self, problem):
-        self.visited = set()
+    def __init__(self, problem, best_g=False, reopen=False, weight=1, visited=None):
+        self.visited = set() if visited is None else visited
         self.problem = problem
+        # the heuristic function, h is a timed wrapper of it when the search collects the timings
+        self.heuristic = problem.h
+        self.h = self.heuristic
+        # weight of the heuristic: with weight w > 1 (weighted A*) the cost of the solution is at most w times the
+        # optimal one, but usually far fewer nodes are expanded
+        self.weight = weight
+        # keep only the cheapest node of each state in the fringe, reopening visited states (for inconsistent
+        # heuristics) implies it
+        self.best_g = best_g
+        self.reopen = reopen
+
+    def new_fringe(self):
+        # fringe ordered following the heuristic function and cost --> f(n) = w * h(n) + g(n)
+        return PriorityFringe(key=self.priority,
+                              visited=self.visited,
+                              best_g={} if self.best_g or self.reopen else None,
+                              reopen=self.reopen)
 
     def add_visited(self, state):
         self.visited.add(state)
 
+    def priority(self, node):
+        return self.weight * self.h(node.state) + node.cost
+
     def select(self, fringe, new_nodes):
-        fringe = fringe + new_nodes
-        fringe = [n for n in fringe if n.state not in self.visited]
-        # sort fringe following the heuristic function and cost --> f(n) = h(n) + g(n)
-        fringe = sorted(fringe, key=lambda x: -(self.problem.h(x.state)+x.cost))
-        return fringe
\ No newline at end of file
+        fringe.extend(new_nodes)
+        return fringe
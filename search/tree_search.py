@@ -1,4 +1,8 @@
-from search.node import Node
+import time
+
+from profiling.profiler import profiled
+from search.node import Node, NodePool
+from search.strategies import BreadthFirst, DepthFirst
 
 
 class TreeSearch:
@@ -6,101 +10,128 @@ class TreeSearch:
     A class able to find a solution with a given search strategy
     """
 
-    def __init__(self, problem, strategy=None):
+    def __init__(self, problem, strategy=None, stats=None, pool=False):
+        if pool and not isinstance(strategy, (BreadthFirst, DepthFirst)):
+            raise ValueError('The nodes can be kept in a pool only by the BreadthFirst and DepthFirst strategies')
         self.problem = problem
         self.strategy = strategy
+        # a SearchStats object collecting counters and timings, None to disable them
+        self.stats = stats
+        # keep the nodes in a NodePool instead of Node objects: the tree strategies only move the nodes between
+        # the new nodes and the fringe, so they work on the indices of the pool, with less than half the memory
+        self.pool = NodePool() if pool else None
         self.fringe = []
-        self.node = Node(state=self.problem.initial_state,
-                         parent=None,
-                         action=None,
-                         cost=0,
-                         depth=0)
 
+    @profiled
     def run(self):
         """
         Run the search
         :return: a path or a failure
         """
+        for result, node, fringe_size, step in self.steps():
+            if result != 'Running':
+                return result, node
 
-        node = Node(state=self.problem.initial_state,
-                    parent=None,
-                    action=None,
-                    cost=0,
-                    depth=0)
-
-        # search loop
-        while True:
-            # check if the node passes the goal test
-            if self.problem.goal_test(node.state):
-                return 'Ok', node
-
-            # add visited for the graph search
-            self.strategy.add_visited(node.state)
-
-            # expand the node
-            new_states = self.problem.successors(node.state)
-            new_nodes = [node.expand(state=s,
-                                     action=a,
-                                     cost=self.problem.cost(node.state, a)) for s, a in new_states]
-
-            # a solution was not found, expand the node and update the fringe coherently with the search strategy
-            self.fringe = self.strategy.select(self.fringe, new_nodes)
-            # Check if the search fails (empty fringe)
-            if len(self.fringe) == 0:
-                return 'Fail', []
-
-            # select the next node to explore
-            node = self.fringe.pop()
-
-    def recursive_run(self):
+    def steps(self):
         """
-        Run the search
-        :return: a path or a failure
+        Run the search one expansion at a time. The caller can stop the search at any moment, interleave
+        several searches or report their progress.
+        :return: a generator of (result, node, fringe size, step) tuples. The result is 'Running' after the
+        expansion of the node (its index with a pool), the last tuple has result 'Ok' with the goal node or 'Fail'
+        with an empty list
         """
-        # check if the node passes the goal test
-        if self.problem.goal_test(self.node.state):
-            return 'Ok', self.node
-
-        # add visited for the graph search
-        self.strategy.add_visited(self.node.state)
-
-        # expand the node
-        new_states = self.problem.successors(self.node.state)
-        new_nodes = [self.node.expand(state=s,
-                                      action=a,
-                                      cost=self.problem.cost(self.node.state, a)) for s, a in new_states]
-
-        # a solution was not found, expand the node and update the fringe coherently with the search strategy
-        self.fringe = self.strategy.select(self.fringe, new_nodes)
-        # Check if the search fails (empty fringe)
-        if len(self.fringe) == 0:
-            return 'Fail', []
-
-        # select the next node to explore
-        self.node = self.fringe.pop()
-        return self.recursive_run()
-
-    def progressive_run(self):
-
-        if self.problem.goal_condition(state=self.node.state):
-            return 'Success', self.node.path()
-
-        self.strategy.add_visited(self.node)
-
-        # A solution was not found, expand the node and update the fringe coherently with the search strategy
-        new_states = self.problem.successors(self.node.state)
-        new_nodes = [self.node.expand(state=ns[0],
-                                      action=ns[1],
-                                      cost=1) for ns in new_states]
-
-        self.fringe = self.strategy.search(self.fringe, new_nodes)
-
-        # Check if the search fails
-        if len(self.fringe) == 0:
-            return 'Fail', []
-
-        # Select the next node to explore
-        self.node = self.fringe.pop()
-        print(f'Exploring node {self.node}')
-
-        return 'Running', self.node
+        pool = self.pool
+        if pool is None:
+            node = Node(state=self.problem.initial_state,
+                        parent=None,
+                        action=None,
+                        cost=0,
+                        depth=0)
+        else:
+            pool = self.pool = NodePool()
+            node = pool.root(self.problem.initial_state)
+        # every search starts from an empty fringe: the strategies without new_fringe use a list
+        self.fringe = getattr(self.strategy, 'new_fringe', list)()
+        early_goal_test = getattr(self.strategy, 'early_goal_test', False)
+        step = 0
+
+        stats = self.stats
+        successors = self.problem.successors
+        cost = self.problem.cost
+        timing = stats is not None and stats.timing
+        if stats is not None:
+            start = time.perf_counter()
+        if timing:
+            successors = stats.timed('successors', successors)
+            cost = stats.timed('cost', cost)
+        # the heuristic is called by the strategy: it is timed wrapping the heuristic of the strategy, never the
+        # previous wrapper, and the problem is left untouched
+        if hasattr(self.strategy, 'heuristic'):
+            self.strategy.h = stats.timed('h', self.strategy.heuristic) if timing else self.strategy.heuristic
+
+        try:
+            # search loop
+            while True:
+                state = node.state if pool is None else pool.get_state(node)
+                # check if the node passes the goal test
+                if self.problem.goal_test(state):
+                    goal = node if pool is None else pool.to_node(node)
+                    if stats is not None:
+                        stats.depth = goal.depth
+                    yield 'Ok', goal, len(self.fringe), step
+                    return
+
+                # add visited for the graph search
+                self.strategy.add_visited(state)
+
+                # expand the node
+                new_states = successors(state)
+                if pool is None:
+                    new_nodes = [node.expand(state=s,
+                                             action=a,
+                                             cost=cost(state, a)) for s, a in new_states]
+                else:
+                    new_nodes = [pool.expand(node, state=s, action=a, cost=cost(state, a)) for s, a in new_states]
+                step += 1
+
+                # some strategies (e.g. breadth first) can run the goal test as soon as the nodes are generated
+                if early_goal_test:
+                    for new_node in new_nodes:
+                        if self.problem.goal_test(new_node.state if pool is None else pool.get_state(new_node)):
+                            goal = new_node if pool is None else pool.to_node(new_node)
+                            if stats is not None:
+                                stats.step(len(new_nodes), len(self.fringe))
+                                stats.depth = goal.depth
+                            yield 'Ok', goal, len(self.fringe), step
+                            return
+
+                # a solution was not found, expand the node and update the fringe coherently with the search strategy
+                if not timing:
+                    self.fringe = self.strategy.select(self.fringe, new_nodes)
+                    fringe_size = len(self.fringe)
+                else:
+                    fringe_start, h_start = time.perf_counter(), stats.time['h']
+                    self.fringe = self.strategy.select(self.fringe, new_nodes)
+                    fringe_size = len(self.fringe)
+                    stats.time['fringe'] += time.perf_counter() - fringe_start - (stats.time['h'] - h_start)
+                if stats is not None:
+                    stats.pruned = getattr(self.fringe, 'pruned', 0)
+                    stats.step(len(new_nodes), fringe_size)
+
+                # Check if the search fails (empty fringe)
+                if fringe_size == 0:
+                    yield 'Fail', [], 0, step
+                    return
+                yield 'Running', node, fringe_size, step
+
+                # select the next node to explore
+                if not timing:
+                    node = self.fringe.pop()
+                else:
+                    fringe_start = time.perf_counter()
+                    node = self.fringe.pop()
+                    stats.time['fringe'] += time.perf_counter() - fringe_start
+        finally:
+            if stats is not None:
+                stats.pruned = getattr(self.fringe, 'pruned', 0)
+                stats.time['total'] += time.perf_counter() - start
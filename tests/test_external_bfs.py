@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+from search.external_bfs import ExternalBreadthFirst
+from search.problem import PancakeProblem
+
+
+class Crash(Exception):
+    pass
+
+
+def crash_after(function, calls, before=True):
+    """
+    Wrap a method of a search so that it raises Crash at a given call, as if the process was killed
+    :param function: the method
+    :param calls: the number of the call that crashes
+    :param before: True to crash before running the method, False after
+    :return: the wrapped method
+    """
+    count = [0]
+
+    def crashing(*args, **kwargs):
+        count[0] += 1
+        if count[0] == calls and before:
+            raise Crash()
+        result = function(*args, **kwargs)
+        if count[0] == calls:
+            raise Crash()
+        return result
+    return crashing
+
+
+def new_search(directory, reversible):
+    search = ExternalBreadthFirst(problem=PancakeProblem(initial_state=(3, 0, 5, 1, 4, 2)), directory=str(directory),
+                                  chunk_size=64, block_size=16)
+    search.reversible = reversible
+    return search
+
+
+@pytest.mark.parametrize('reversible', [True, False])
+@pytest.mark.parametrize('method, calls, before', [
+    # killed while merging the runs of a layer: the runs and a .tmp file are left behind
+    ('merge', 3, True),
+    # killed after the layer (and its visited keys) was written, before it was recorded in the manifest
+    ('save_manifest', 3, True),
+    # killed after the layer was recorded, before the visited keys of the previous one were removed
+    ('save_manifest', 3, False),
+])
+def test_resume_after_crash(tmp_path, reversible, method, calls, before):
+    expected = new_search(tmp_path / 'clean', reversible)
+    expected_result, expected_node = expected.run()
+
+    search = new_search(tmp_path / 'crash', reversible)
+    setattr(search, method, crash_after(getattr(search, method), calls, before))
+    with pytest.raises(Crash):
+        search.run()
+    # the search resumes from the completed layers instead of starting again
+    with open(tmp_path / 'crash' / 'manifest.json') as file:
+        assert len(json.load(file)['layers']) > 1
+    # a crash in the middle of a write also leaves partial files
+    for name in ('run_0099.bin', 'layer_0099.bin.tmp'):
+        (tmp_path / 'crash' / name).write_bytes(b'\0' * 5)
+
+    resumed = new_search(tmp_path / 'crash', reversible)
+    result, node = resumed.run()
+    assert result == expected_result == 'Ok'
+    assert resumed.layers == expected.layers
+    assert node.state == expected_node.state
+    assert len(node.path()) == len(expected_node.path())
+    # only the layers and, without reversible actions, the visited keys of the last one are left
+    names = sorted(os.listdir(tmp_path / 'crash'))
+    assert not [name for name in names if name.startswith('run_') or name.endswith('.tmp')]
+    assert len([name for name in names if name.startswith('visited_')]) == (0 if reversible else 1)
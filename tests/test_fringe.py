@@ -0,0 +1,98 @@
+import random
+from collections import Counter
+
+from search.strategies import AStar, GraphUniformCost
+from search.tree_search import TreeSearch
+
+
+class GraphProblem:
+    """
+    Path on a weighted directed graph given as a dictionary state -> list of (state, cost), with a heuristic
+    given as a dictionary
+    """
+
+    def __init__(self, edges, heuristic, initial_state, goal_state):
+        self.edges = edges
+        self.heuristic = heuristic
+        self.initial_state = initial_state
+        self.goal_state = goal_state
+
+    def successors(self, state):
+        return [(next_state, next_state) for next_state, _ in self.edges[state]]
+
+    def cost(self, state, action):
+        return dict(self.edges[state])[action]
+
+    def goal_test(self, state):
+        return state == self.goal_state
+
+    def h(self, state):
+        return self.heuristic[state]
+
+
+# h(A) is admissible but inconsistent: C is expanded first through B, at a higher cost than through A
+EDGES = {'S': [('A', 1), ('B', 4)], 'A': [('C', 1)], 'B': [('C', 1)], 'C': [('G', 5)], 'G': []}
+HEURISTIC = {'S': 0, 'A': 5, 'B': 0, 'C': 0, 'G': 0}
+
+
+def check_fringe(search):
+    """
+    Run a search checking the fringe after every expansion: at most one live entry per state, and the counter of
+    the superseded entries equal to the entries with a cost higher than the best one of their state
+    :return: the result and the goal node
+    """
+    for result, node, _, _ in search.steps():
+        fringe = search.fringe
+        if result != 'Running':
+            return result, node
+        live = Counter(entry[2].state for entry in fringe.heap
+                       if entry[2].cost == fringe.best_g[entry[2].state] and entry[2].state not in fringe.visited)
+        assert all(count == 1 for count in live.values())
+        superseded = sum(entry[2].cost > fringe.best_g[entry[2].state] for entry in fringe.heap)
+        assert fringe.superseded == superseded
+
+
+def test_best_g_without_reopen_misses_the_cheaper_path():
+    problem = GraphProblem(EDGES, HEURISTIC, 'S', 'G')
+    result, node = check_fringe(TreeSearch(problem=problem, strategy=AStar(problem, best_g=True)))
+    assert result == 'Ok'
+    assert node.cost == 10
+
+
+def test_reopen_finds_the_optimal_path():
+    problem = GraphProblem(EDGES, HEURISTIC, 'S', 'G')
+    result, node = check_fringe(TreeSearch(problem=problem, strategy=AStar(problem, reopen=True)))
+    assert result == 'Ok'
+    assert node.cost == 7
+    assert node.path() == ['A', 'C', 'G']
+
+
+def test_random_graphs_with_inconsistent_heuristics():
+    rng = random.Random(5)
+    # instances where only reopening finds the optimal path
+    suboptimal = 0
+    for _ in range(30):
+        states = list(range(40))
+        edges = {s: [(t, rng.randint(1, 9)) for t in rng.sample(states, 4) if t != s] for s in states}
+        problem = GraphProblem(edges, dict.fromkeys(states, 0), 0, 39)
+        result, node = TreeSearch(problem=problem, strategy=GraphUniformCost()).run()
+        if result != 'Ok':
+            continue
+
+        # a random fraction of the exact distance to the goal: admissible, usually inconsistent
+        distances = {}
+        for state in states:
+            problem.initial_state = state
+            found, goal = TreeSearch(problem=problem, strategy=GraphUniformCost()).run()
+            distances[state] = goal.cost if found == 'Ok' else 0
+        problem.heuristic = {state: distance * rng.random() for state, distance in distances.items()}
+        problem.initial_state = 0
+
+        for strategy in (AStar(problem, best_g=True, reopen=True), AStar(problem, reopen=True)):
+            found, goal = check_fringe(TreeSearch(problem=problem, strategy=strategy))
+            assert found == 'Ok'
+            assert goal.cost == node.cost
+        found, goal = check_fringe(TreeSearch(problem=problem, strategy=AStar(problem, best_g=True)))
+        assert goal.cost >= node.cost
+        suboptimal += goal.cost > node.cost
+    assert suboptimal > 0
@@ -0,0 +1,29 @@
+from benchmark.instances import generate
+from search.bidirectional import BidirectionalSearch
+from search.heuristic_cache import HeuristicCache
+
+
+def test_bidirectional_astar_on_cached_problem():
+    for index in range(30):
+        problem = generate('grid', index, 5, size=25, density=0.3)
+        cached = HeuristicCache(problem)
+        search = BidirectionalSearch(cached, heuristic=True)
+        # the backward direction estimates the distance to the initial state, with its own cache
+        assert search.backward_problem.goal_state == problem.initial_state
+        assert search.backward_problem.h(problem.initial_state) == 0
+        assert cached.goal_state == problem.goal_state
+
+        expected = BidirectionalSearch(problem).run()
+        result = search.run()
+        assert result[0] == expected[0]
+        if result[0] == 'Ok':
+            assert abs(result[1].cost - expected[1].cost) < 1e-9
+
+
+def test_new_goal_clears_the_cache():
+    problem = generate('grid', 0, 5, size=25, density=0.3)
+    cached = HeuristicCache(problem)
+    cached.h(problem.initial_state)
+    cached.goal_state = problem.initial_state
+    assert problem.goal_state == problem.initial_state
+    assert cached.h(problem.initial_state) == 0
@@ -0,0 +1,19 @@
+from input.roads import Roads, compile_roads
+from search.oracle import build_hub_label_oracle, build_matrix_oracle
+from search.problem import StreetProblem
+
+# A and B are two junctions with the same coordinates, the street between them has zero length
+streets = {'S': ['A'], 'A': ['S', 'B'], 'B': ['A', 'C'], 'C': ['B', 'T'], 'T': ['C']}
+coordinates = {'S': (41.0, 16.0), 'A': (41.1, 16.0), 'B': (41.1, 16.0), 'C': (41.2, 16.1), 'T': (41.3, 16.1)}
+
+
+def test_paths_cross_streets_of_zero_length():
+    roads = Roads(streets=streets, coordinates=coordinates)
+    graph = compile_roads(roads)
+    for oracle in (build_matrix_oracle(graph), build_hub_label_oracle(graph)):
+        for initial_state, path in [('S', ['A', 'B', 'C', 'T']), ('A', ['B', 'C', 'T']), ('B', ['C', 'T'])]:
+            problem = StreetProblem(initial_state=initial_state, goal_state='T', environment=roads, oracle=oracle)
+            result, node = problem.solve()
+            assert result == 'Ok'
+            assert node.state == 'T'
+            assert node.path() == path
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from search.parallel import HashDistributedSearch
+from search.problem import EightTilesProblem
+from search.strategies import AStar
+
+
+class CrashingStrategy:
+    """
+    A strategy killing its worker process at the first node, as the system does when it runs out of memory
+    """
+
+    def priority(self, node):
+        os._exit(3)
+
+
+def test_dead_worker_raises():
+    problem = EightTilesProblem(initial_state=(1, 2, 3, 4, 5, 6, 0, 7, 8))
+    search = HashDistributedSearch(problem=problem, strategy=CrashingStrategy(), workers=2)
+    with pytest.raises(RuntimeError):
+        search.run()
+
+
+def test_search_finds_the_optimal_path():
+    problem = EightTilesProblem(initial_state=(1, 2, 3, 4, 5, 6, 0, 7, 8))
+    result, node = HashDistributedSearch(problem=problem, strategy=AStar(problem), workers=2).run()
+    assert result == 'Ok'
+    assert node.cost == 2
@@ -0,0 +1,26 @@
+import pytest
+
+from search.pattern_database import build_additive_pattern_database, load_additive_pattern_database
+
+
+def test_load_the_saved_partition_only(tmp_path):
+    first = [(1, 2, 3, 4), (5, 6, 7, 8)]
+    second = [(1, 2, 3), (4, 5, 6), (7, 8)]
+    build_additive_pattern_database(3, first).save(tmp_path)
+    build_additive_pattern_database(3, second).save(tmp_path)
+
+    pdb = load_additive_pattern_database(tmp_path, 3)
+    assert [pdb.pattern for pdb in pdb.databases] == second
+    pdb = load_additive_pattern_database(tmp_path, 3, partition=first)
+    assert [pdb.pattern for pdb in pdb.databases] == first
+
+    # one move away from the goal: an admissible heuristic is at most 1
+    assert pdb.h((1, 2, 3, 4, 5, 6, 7, 0, 8)) == 1
+
+
+def test_overlapping_partition_is_refused(tmp_path):
+    build_additive_pattern_database(3).save(tmp_path)
+    with pytest.raises(ValueError):
+        load_additive_pattern_database(tmp_path, 3, partition=[(1, 2, 3, 4), (4, 5, 6, 7, 8)])
+    with pytest.raises(FileNotFoundError):
+        load_additive_pattern_database(tmp_path, 4)
@@ -0,0 +1,35 @@
+import os
+
+from search.portfolio import Portfolio
+from search.problem import EightTilesProblem
+from search.strategies import AStar
+
+
+class CrashingStrategy:
+    """
+    A strategy killing its worker process at the first expansion, as the system does when it runs out of memory
+    """
+
+    def add_visited(self, state):
+        os._exit(3)
+
+    def select(self, fringe, new_nodes):
+        return fringe
+
+
+def test_dead_worker_is_a_failed_configuration():
+    problem = EightTilesProblem(initial_state=(1, 2, 3, 4, 5, 6, 0, 7, 8))
+    portfolio = Portfolio(problem=problem,
+                          configurations=[('Crash', CrashingStrategy()), ('AStar', AStar(problem))],
+                          mode='best')
+    result, node = portfolio.run()
+    assert result == 'Ok'
+    assert portfolio.winner == 'AStar'
+    assert portfolio.results['Crash'][0] == 'Error: exit code 3'
+
+
+def test_only_dead_workers_fail():
+    problem = EightTilesProblem(initial_state=(1, 2, 3, 4, 5, 6, 0, 7, 8))
+    portfolio = Portfolio(problem=problem, configurations=[('Crash', CrashingStrategy())])
+    assert portfolio.run() == ('Fail', [])
+    assert portfolio.results['Crash'][0] == 'Error: exit code 3'
@@ -0,0 +1,25 @@
+from input.roads import roads_small, roads_small_coords
+from search.problem import StreetProblem
+from search.strategies import GraphUniformCost
+from search.tree_search import TreeSearch
+
+
+class Streets:
+    """
+    An environment with only streets, coordinates and distance, as before the symmetric flag of Roads
+    """
+
+    def __init__(self):
+        self.streets = roads_small
+        self.coordinates = roads_small_coords
+
+    def distance(self, start, end):
+        return 1
+
+
+def test_environment_without_symmetric():
+    problem = StreetProblem(initial_state='Andria', goal_state='Bari', environment=Streets())
+    assert not problem.symmetric
+    result, node = TreeSearch(problem=problem, strategy=GraphUniformCost()).run()
+    assert result == 'Ok'
+    assert node.state == 'Bari'
@@ -0,0 +1,21 @@
+import random
+
+from benchmark.instances import random_roads
+from search.routing import RouteQueries
+
+
+def test_batch_computes_every_tree_once():
+    rng = random.Random(3)
+    roads = random_roads(rng, 60)
+    cities = sorted(roads.streets)
+    origins = cities[:4]
+    destinations = cities[10:21]
+    # interleaved queries: every origin comes again after the other three
+    queries = [(origin, destination) for destination in destinations for origin in origins]
+
+    routes = RouteQueries(roads, max_trees=2)
+    answers = routes.batch(queries)
+    assert routes.built == len(origins)
+
+    unlimited = RouteQueries(roads)
+    assert answers == [unlimited.query(origin, destination) for origin, destination in queries]
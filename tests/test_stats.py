@@ -0,0 +1,42 @@
+import pytest
+
+from search.heuristic_cache import HeuristicCache
+from search.problem import EightTilesProblem
+from search.stats import SearchStats
+from search.strategies import AStar
+from search.tree_search import TreeSearch
+
+
+def test_timing_leaves_the_problem_untouched():
+    problem = EightTilesProblem(initial_state=(1, 2, 3, 4, 5, 6, 0, 7, 8))
+    stats = SearchStats()
+    steps = TreeSearch(problem=problem, strategy=AStar(problem), stats=stats).steps()
+    # the first search is abandoned after a few expansions, the second one runs while it is still open
+    for _ in range(2):
+        next(steps)
+    result, node = TreeSearch(problem=problem, strategy=AStar(problem), stats=SearchStats()).run()
+    assert result == 'Ok'
+    assert 'h' not in vars(problem)
+    assert stats.time['h'] > 0
+
+
+def test_timing_keeps_the_heuristic_of_the_strategy():
+    problem = EightTilesProblem(initial_state=(1, 2, 3, 4, 5, 6, 0, 7, 8))
+    cached = HeuristicCache(problem)
+    strategy = AStar(cached)
+    stats = SearchStats()
+    for _ in range(2):
+        result, node = TreeSearch(problem=problem, strategy=strategy, stats=stats).run()
+        assert result == 'Ok'
+    assert cached.misses > 0
+    assert cached.hits > 0
+    # a run without timing calls the heuristic of the strategy directly again
+    TreeSearch(problem=problem, strategy=strategy).run()
+    assert strategy.h == cached.h
+
+
+def test_every_requires_callback():
+    with pytest.raises(ValueError):
+        SearchStats(every=10)
+    with pytest.raises(ValueError):
+        SearchStats(every=0, callback=print)
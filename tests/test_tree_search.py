@@ -0,0 +1,34 @@
+import pytest
+
+from input.roads import Roads, roads_small, roads_small_coords
+from search.problem import StreetProblem
+from search.strategies import AStar, BreadthFirst, DepthLimited
+from search.tree_search import TreeSearch
+
+
+def test_tree_strategies_can_be_reused():
+    roads = Roads(streets=roads_small, coordinates=roads_small_coords)
+    for strategy, new_strategy in [(BreadthFirst(), BreadthFirst), (DepthLimited(limit=4), lambda: DepthLimited(4))]:
+        TreeSearch(problem=StreetProblem('Andria', 'Bari', roads), strategy=strategy).run()
+        result, node = TreeSearch(problem=StreetProblem('Bari', 'Andria', roads), strategy=strategy).run()
+        expected = TreeSearch(problem=StreetProblem('Bari', 'Andria', roads), strategy=new_strategy()).run()[1]
+        assert result == 'Ok'
+        assert node.path() == expected.path()
+
+
+def test_pool_finds_the_same_path():
+    roads = Roads(streets=roads_small, coordinates=roads_small_coords)
+    problem = StreetProblem('Andria', 'Bari', roads)
+    for new_strategy in (BreadthFirst, lambda: BreadthFirst(early_goal_test=True)):
+        expected = TreeSearch(problem=problem, strategy=new_strategy()).run()[1]
+        result, node = TreeSearch(problem=problem, strategy=new_strategy(), pool=True).run()
+        assert result == 'Ok'
+        assert node.path() == expected.path()
+        assert node.cost == pytest.approx(expected.cost)
+        assert node.depth == expected.depth
+
+
+def test_pool_needs_a_tree_strategy():
+    problem = StreetProblem('Andria', 'Bari', Roads(streets=roads_small, coordinates=roads_small_coords))
+    with pytest.raises(ValueError):
+        TreeSearch(problem=problem, strategy=AStar(problem), pool=True)